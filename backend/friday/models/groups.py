@@ -1,13 +1,18 @@
 import json
 import logging
 import time
-from typing import Optional
+from typing import Iterable, Optional
 import uuid
 
 from friday.internal.db import Base, get_db
 from friday.env import SRC_LOG_LEVELS
 
 from friday.models.files import FileMetadataResponse
+from friday.retrieval.query_cache import (
+    UNIFIED_SEARCH_CACHE,
+    invalidate_user_collections,
+)
+from friday.retrieval.text_index import NOTES_INDEX_CACHE, PROMPTS_INDEX_CACHE
 
 
 from pydantic import BaseModel, ConfigDict
@@ -91,6 +96,31 @@ class GroupUpdateForm(GroupForm, UserIdsForm):
     pass
 
 
+def _invalidate_search_caches(user_ids: Optional[Iterable[str]]) -> None:
+    """
+    Drop cached search state of users whose group membership changed
+
+    Group membership decides which knowledge bases, notes and prompts a user
+    can read, so every per-user search cache depends on it.
+
+    Args:
+        user_ids: Affected users; when None, every user is invalidated
+    """
+    if user_ids is not None:
+        user_ids = set(user_ids)
+        if not user_ids:
+            return
+
+    NOTES_INDEX_CACHE.invalidate(user_ids)
+    PROMPTS_INDEX_CACHE.invalidate(user_ids)
+    UNIFIED_SEARCH_CACHE.bump_versions(user_ids)
+    if user_ids is None:
+        invalidate_user_collections()
+    else:
+        for user_id in user_ids:
+            invalidate_user_collections(user_id)
+
+
 class GroupTable:
     def insert_new_group(
         self, user_id: str, form_data: GroupForm
@@ -161,6 +191,7 @@ class GroupTable:
     ) -> Optional[GroupModel]:
         try:
             with get_db() as db:
+                previous_user_ids = self.get_group_user_ids_by_id(id) or []
                 db.query(Group).filter_by(id=id).update(
                     {
                         **form_data.model_dump(exclude_none=True),
@@ -168,7 +199,11 @@ class GroupTable:
                     }
                 )
                 db.commit()
-                return self.get_group_by_id(id=id)
+                group = self.get_group_by_id(id=id)
+                _invalidate_search_caches(
+                    [*previous_user_ids, *(group.user_ids if group else [])]
+                )
+                return group
         except Exception as e:
             log.exception(e)
             return None
@@ -176,8 +211,10 @@ class GroupTable:
     def delete_group_by_id(self, id: str) -> bool:
         try:
             with get_db() as db:
+                user_ids = self.get_group_user_ids_by_id(id) or []
                 db.query(Group).filter_by(id=id).delete()
                 db.commit()
+                _invalidate_search_caches(user_ids)
                 return True
         except Exception:
             return False
@@ -187,6 +224,7 @@ class GroupTable:
             try:
                 db.query(Group).delete()
                 db.commit()
+                _invalidate_search_caches(None)
 
                 return True
             except Exception:
@@ -207,6 +245,8 @@ class GroupTable:
                     )
                     db.commit()
 
+                if groups:
+                    _invalidate_search_caches([user_id])
                 return True
             except Exception:
                 return False
@@ -274,6 +314,7 @@ class GroupTable:
                         )
 
                 db.commit()
+                _invalidate_search_caches([user_id])
                 return True
             except Exception as e:
                 log.exception(e)
@@ -302,6 +343,7 @@ class GroupTable:
                 group.updated_at = int(time.time())
                 db.commit()
                 db.refresh(group)
+                _invalidate_search_caches(user_ids)
                 return GroupModel.model_validate(group)
         except Exception as e:
             log.exception(e)
@@ -332,6 +374,7 @@ class GroupTable:
 
                 db.commit()
                 db.refresh(group)
+                _invalidate_search_caches(user_ids)
                 return GroupModel.model_validate(group)
         except Exception as e:
             log.exception(e)
@@ -16,6 +16,10 @@ from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Column, String, Text, JSON
 
 from friday.utils.access_control import has_access
+from friday.retrieval.query_cache import (
+    UNIFIED_SEARCH_CACHE,
+    invalidate_user_collections,
+)
 
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MODELS"])
@@ -120,6 +124,8 @@ class KnowledgeTable:
                 db.add(result)
                 db.commit()
                 db.refresh(result)
+                UNIFIED_SEARCH_CACHE.bump_version()
+                invalidate_user_collections()
                 if result:
                     return KnowledgeModel.model_validate(result)
                 else:
@@ -195,6 +201,8 @@ class KnowledgeTable:
                     }
                 )
                 db.commit()
+                UNIFIED_SEARCH_CACHE.bump_version()
+                invalidate_user_collections()
                 return self.get_knowledge_by_id(id=id)
         except Exception as e:
             log.exception(e)
@@ -213,6 +221,8 @@ class KnowledgeTable:
                     }
                 )
                 db.commit()
+                UNIFIED_SEARCH_CACHE.bump_version()
+                invalidate_user_collections()
                 return self.get_knowledge_by_id(id=id)
         except Exception as e:
             log.exception(e)
@@ -223,6 +233,8 @@ class KnowledgeTable:
             with get_db() as db:
                 db.query(Knowledge).filter_by(id=id).delete()
                 db.commit()
+                UNIFIED_SEARCH_CACHE.bump_version()
+                invalidate_user_collections()
                 return True
         except Exception:
             return False
@@ -232,6 +244,8 @@ class KnowledgeTable:
             try:
                 db.query(Knowledge).delete()
                 db.commit()
+                UNIFIED_SEARCH_CACHE.bump_version()
+                invalidate_user_collections()
 
                 return True
             except Exception:
@@ -3,6 +3,7 @@ import uuid
 from typing import Optional
 
 from friday.internal.db import Base, get_db
+from friday.retrieval.query_cache import UNIFIED_SEARCH_CACHE
 from pydantic import BaseModel, ConfigDict
 from sqlalchemy import BigInteger, Column, String, Text
 
@@ -58,11 +59,38 @@ class MemoriesTable:
             db.add(result)
             db.commit()
             db.refresh(result)
+            UNIFIED_SEARCH_CACHE.bump_version(user_id)
             if result:
                 return MemoryModel.model_validate(result)
             else:
                 return None
 
+    def insert_new_memories_bulk(
+        self,
+        user_id: str,
+        contents: list[str],
+    ) -> list[MemoryModel]:
+        """Insert several memories for a user in a single transaction"""
+        if not contents:
+            return []
+
+        now = int(time.time())
+        memories = [
+            MemoryModel(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                content=content,
+                created_at=now,
+                updated_at=now,
+            )
+            for content in contents
+        ]
+        with get_db() as db:
+            db.add_all([Memory(**memory.model_dump()) for memory in memories])
+            db.commit()
+        UNIFIED_SEARCH_CACHE.bump_version(user_id)
+        return memories
+
     def update_memory_by_id_and_user_id(
         self,
         id: str,
@@ -79,6 +107,7 @@ class MemoriesTable:
                 memory.updated_at = int(time.time())
 
                 db.commit()
+                UNIFIED_SEARCH_CACHE.bump_version(user_id)
                 return self.get_memory_by_id(id)
             except Exception:
                 return None
@@ -112,6 +141,7 @@ class MemoriesTable:
             try:
                 db.query(Memory).filter_by(id=id).delete()
                 db.commit()
+                UNIFIED_SEARCH_CACHE.bump_version()
 
                 return True
 
@@ -123,6 +153,21 @@ class MemoriesTable:
             try:
                 db.query(Memory).filter_by(user_id=user_id).delete()
                 db.commit()
+                UNIFIED_SEARCH_CACHE.bump_version(user_id)
+
+                return True
+            except Exception:
+                return False
+
+    def delete_memories_by_ids_and_user_id(self, ids: list[str], user_id: str) -> bool:
+        """Delete several of a user's memories in a single transaction"""
+        with get_db() as db:
+            try:
+                db.query(Memory).filter(
+                    Memory.id.in_(ids), Memory.user_id == user_id
+                ).delete(synchronize_session=False)
+                db.commit()
+                UNIFIED_SEARCH_CACHE.bump_version(user_id)
 
                 return True
             except Exception:
@@ -138,6 +183,7 @@ class MemoriesTable:
                 # Delete the memory
                 db.delete(memory)
                 db.commit()
+                UNIFIED_SEARCH_CACHE.bump_version(user_id)
 
                 return True
             except Exception:
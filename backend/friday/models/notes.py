@@ -6,8 +6,14 @@ from functools import lru_cache
 
 from friday.internal.db import Base, get_db
 from friday.models.groups import Groups
-from friday.utils.access_control import has_access
+from friday.utils.access_control import (
+    get_access_control_filter,
+    get_user_ids_with_access,
+    has_access,
+)
 from friday.models.users import Users, UserResponse
+from friday.retrieval.query_cache import UNIFIED_SEARCH_CACHE
+from friday.retrieval.text_index import NOTES_INDEX_CACHE
 
 
 from pydantic import BaseModel, ConfigDict
@@ -75,6 +81,27 @@ class NoteUserResponse(NoteModel):
     user: Optional[UserResponse] = None
 
 
+def _has_note_permission(
+    note: Note, user_id: str, permission: str, user_group_ids: set[str]
+) -> bool:
+    # Fast-pass #1: owner
+    if note.user_id == user_id:
+        return True
+    # Fast-pass #2: public/open
+    if note.access_control is None:
+        # Technically this should mean public access for both read and write, but we'll only do read for now
+        # We might want to change this behavior later
+        return permission == "read"
+    return has_access(user_id, permission, note.access_control, user_group_ids)
+
+
+def _invalidate_search_caches(user_id: str, *access_controls: Optional[dict]) -> None:
+    """Drop cached search state of everyone who can read a note under the given access controls"""
+    readers = get_user_ids_with_access(user_id, "read", *access_controls)
+    NOTES_INDEX_CACHE.invalidate(readers)
+    UNIFIED_SEARCH_CACHE.bump_versions(readers)
+
+
 class NoteTable:
     def insert_new_note(
         self,
@@ -96,6 +123,7 @@ class NoteTable:
 
             db.add(new_note)
             db.commit()
+            _invalidate_search_caches(note.user_id, note.access_control)
             return note
 
     def get_notes(
@@ -151,20 +179,7 @@ class NoteTable:
             n_skipped = 0
 
             for note in query:
-                # Fast-pass #1: owner
-                if note.user_id == user_id:
-                    permitted = True
-                # Fast-pass #2: public/open
-                elif note.access_control is None:
-                    # Technically this should mean public access for both read and write, but we'll only do read for now
-                    # We might want to change this behavior later
-                    permitted = permission == "read"
-                else:
-                    permitted = has_access(
-                        user_id, permission, note.access_control, user_group_ids
-                    )
-
-                if not permitted:
+                if not _has_note_permission(note, user_id, permission, user_group_ids):
                     continue
 
                 # Apply skip AFTER permission filtering so it counts only accessible notes
@@ -178,6 +193,81 @@ class NoteTable:
 
             return results
 
+    def search_notes_fulltext(
+        self,
+        user_id: str,
+        query: str,
+        permission: str = "read",
+        limit: int = 100,
+    ) -> list[NoteModel]:
+        """
+        Fetch up to `limit` accessible notes matching the query text.
+
+        The text match runs in the database (tsvector ranking on PostgreSQL,
+        case-insensitive LIKE elsewhere) and is restricted to notes the user
+        could have access to, so only candidate notes are loaded; the exact
+        permission check is applied to the candidates afterwards.
+        """
+        terms = query.split()
+        if not terms:
+            return []
+
+        with get_db() as db:
+            user_group_ids = {
+                group.id for group in Groups.get_groups_by_member_id(user_id)
+            }
+
+            title = func.coalesce(Note.title, "")
+            # Same fallback as the search index: markdown, then plain text
+            content = func.coalesce(
+                func.nullif(Note.data[("content", "md")].as_string(), ""),
+                Note.data[("content", "text")].as_string(),
+                "",
+            )
+
+            db_query = db.query(Note).filter(
+                get_access_control_filter(
+                    Note.user_id,
+                    Note.access_control,
+                    user_id,
+                    permission,
+                    user_group_ids,
+                )
+            )
+            if db.bind.dialect.name == "postgresql":
+                document = func.to_tsvector(
+                    "english", func.concat_ws(" ", title, content)
+                )
+                # Match any term, like the LIKE fallback below
+                ts_query = func.websearch_to_tsquery("english", " or ".join(terms))
+                db_query = db_query.filter(document.op("@@")(ts_query)).order_by(
+                    func.ts_rank(document, ts_query).desc()
+                )
+            else:
+                db_query = db_query.filter(
+                    or_(
+                        *[
+                            or_(
+                                title.icontains(term, autoescape=True),
+                                content.icontains(term, autoescape=True),
+                            )
+                            for term in terms
+                        ]
+                    )
+                ).order_by(Note.updated_at.desc())
+
+            # Over-fetch so notes removed by the exact permission check can be replaced
+            results: list[NoteModel] = []
+            for note in db_query.limit(limit * 4).yield_per(256):
+                if not _has_note_permission(note, user_id, permission, user_group_ids):
+                    continue
+
+                results.append(NoteModel.model_validate(note))
+                if len(results) >= limit:
+                    break
+
+            return results
+
     def get_note_by_id(self, id: str) -> Optional[NoteModel]:
         with get_db() as db:
             note = db.query(Note).filter(Note.id == id).first()
@@ -192,6 +282,7 @@ class NoteTable:
                 return None
 
             form_data = form_data.model_dump(exclude_unset=True)
+            previous_access_control = note.access_control
 
             if "title" in form_data:
                 note.title = form_data["title"]
@@ -206,12 +297,19 @@ class NoteTable:
             note.updated_at = int(time.time_ns())
 
             db.commit()
+            _invalidate_search_caches(
+                note.user_id, previous_access_control, note.access_control
+            )
             return NoteModel.model_validate(note) if note else None
 
     def delete_note_by_id(self, id: str):
         with get_db() as db:
-            db.query(Note).filter(Note.id == id).delete()
-            db.commit()
+            note = db.query(Note).filter(Note.id == id).first()
+            if note:
+                user_id, access_control = note.user_id, note.access_control
+                db.delete(note)
+                db.commit()
+                _invalidate_search_caches(user_id, access_control)
             return True
 
 
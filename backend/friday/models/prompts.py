@@ -6,9 +6,15 @@ from friday.models.groups import Groups
 from friday.models.users import Users, UserResponse
 
 from pydantic import BaseModel, ConfigDict
-from sqlalchemy import BigInteger, Column, String, Text, JSON
+from sqlalchemy import BigInteger, Column, String, Text, JSON, func, or_
 
-from friday.utils.access_control import has_access
+from friday.utils.access_control import (
+    get_access_control_filter,
+    get_user_ids_with_access,
+    has_access,
+)
+from friday.retrieval.query_cache import UNIFIED_SEARCH_CACHE
+from friday.retrieval.text_index import PROMPTS_INDEX_CACHE
 
 ####################
 # Prompts DB Schema
@@ -69,6 +75,13 @@ class PromptForm(BaseModel):
     access_control: Optional[dict] = None
 
 
+def _invalidate_search_caches(user_id: str, *access_controls: Optional[dict]) -> None:
+    """Drop cached search state of everyone who can read a prompt under the given access controls"""
+    readers = get_user_ids_with_access(user_id, "read", *access_controls)
+    PROMPTS_INDEX_CACHE.invalidate(readers)
+    UNIFIED_SEARCH_CACHE.bump_versions(readers)
+
+
 class PromptsTable:
     def insert_new_prompt(
         self, user_id: str, form_data: PromptForm
@@ -87,6 +100,7 @@ class PromptsTable:
                 db.add(result)
                 db.commit()
                 db.refresh(result)
+                _invalidate_search_caches(result.user_id, result.access_control)
                 if result:
                     return PromptModel.model_validate(result)
                 else:
@@ -138,17 +152,90 @@ class PromptsTable:
             or has_access(user_id, permission, prompt.access_control, user_group_ids)
         ]
 
+    def search_prompts_fulltext(
+        self,
+        user_id: str,
+        query: str,
+        permission: str = "read",
+        limit: int = 100,
+    ) -> list[PromptModel]:
+        """
+        Fetch up to `limit` accessible prompts matching the query text.
+
+        The text match runs in the database (tsvector ranking on PostgreSQL,
+        case-insensitive LIKE elsewhere) and is restricted to prompts the user
+        could have access to, so only candidate prompts are loaded; the exact
+        permission check is applied to the candidates afterwards.
+        """
+        terms = query.split()
+        if not terms:
+            return []
+
+        with get_db() as db:
+            user_group_ids = {
+                group.id for group in Groups.get_groups_by_member_id(user_id)
+            }
+
+            columns = [
+                Prompt.command,
+                func.coalesce(Prompt.title, ""),
+                func.coalesce(Prompt.content, ""),
+            ]
+
+            db_query = db.query(Prompt).filter(
+                get_access_control_filter(
+                    Prompt.user_id,
+                    Prompt.access_control,
+                    user_id,
+                    permission,
+                    user_group_ids,
+                )
+            )
+            if db.bind.dialect.name == "postgresql":
+                document = func.to_tsvector("english", func.concat_ws(" ", *columns))
+                # Match any term, like the LIKE fallback below
+                ts_query = func.websearch_to_tsquery("english", " or ".join(terms))
+                db_query = db_query.filter(document.op("@@")(ts_query)).order_by(
+                    func.ts_rank(document, ts_query).desc()
+                )
+            else:
+                db_query = db_query.filter(
+                    or_(
+                        *[
+                            column.icontains(term, autoescape=True)
+                            for term in terms
+                            for column in columns
+                        ]
+                    )
+                ).order_by(Prompt.timestamp.desc())
+
+            # Over-fetch so prompts removed by the exact permission check can be replaced
+            results: list[PromptModel] = []
+            for prompt in db_query.limit(limit * 4).all():
+                if prompt.user_id == user_id or has_access(
+                    user_id, permission, prompt.access_control, user_group_ids
+                ):
+                    results.append(PromptModel.model_validate(prompt))
+                    if len(results) >= limit:
+                        break
+
+            return results
+
     def update_prompt_by_command(
         self, command: str, form_data: PromptForm
     ) -> Optional[PromptModel]:
         try:
             with get_db() as db:
                 prompt = db.query(Prompt).filter_by(command=command).first()
+                previous_access_control = prompt.access_control
                 prompt.title = form_data.title
                 prompt.content = form_data.content
                 prompt.access_control = form_data.access_control
                 prompt.timestamp = int(time.time())
                 db.commit()
+                _invalidate_search_caches(
+                    prompt.user_id, previous_access_control, prompt.access_control
+                )
                 return PromptModel.model_validate(prompt)
         except Exception:
             return None
@@ -156,8 +243,12 @@ class PromptsTable:
     def delete_prompt_by_command(self, command: str) -> bool:
         try:
             with get_db() as db:
-                db.query(Prompt).filter_by(command=command).delete()
-                db.commit()
+                prompt = db.query(Prompt).filter_by(command=command).first()
+                if prompt:
+                    user_id, access_control = prompt.user_id, prompt.access_control
+                    db.delete(prompt)
+                    db.commit()
+                    _invalidate_search_caches(user_id, access_control)
 
                 return True
         except Exception:
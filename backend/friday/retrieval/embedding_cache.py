@@ -0,0 +1,91 @@
+"""
+Embedding Cache Module for Friday
+
+This module caches embeddings by model, prefix and text on top of the
+QueryCache LRU, so repeated texts skip the (often remote) embedding
+model call entirely.
+
+Author: Friday AI
+"""
+
+import hashlib
+from typing import Callable, Optional
+
+from friday.retrieval.query_cache import QueryCache
+
+# Maximum number of cached embeddings before the least recently used is evicted
+EMBEDDING_CACHE_MAX_SIZE = 2000
+
+# Lifetime of a cached embedding in seconds
+EMBEDDING_CACHE_TTL = 600
+
+
+class QueryEmbeddingCache(QueryCache):
+    """QueryCache of embeddings, keyed by content instead of by user"""
+
+    def __init__(
+        self, max_size: int = EMBEDDING_CACHE_MAX_SIZE, ttl: float = EMBEDDING_CACHE_TTL
+    ):
+        super().__init__(max_size=max_size, ttl=ttl)
+
+    @staticmethod
+    def make_key(model: str, text: str, prefix: Optional[str] = None) -> bytes:
+        """Build a cache key for an embedding model, query prefix and text"""
+        raw = "\x00".join((model or "", prefix or "", text))
+        return hashlib.blake2b(raw.encode(), digest_size=16).digest()
+
+
+# Shared cache for query embeddings
+QUERY_EMBEDDING_CACHE = QueryEmbeddingCache()
+
+# Cache for extracted memory embeddings, so repeated memories skip the model
+MEMORY_EMBEDDING_CACHE = QueryEmbeddingCache(max_size=4096)
+
+
+def cached_embedding_function(
+    embedding_function: Callable,
+    model: str,
+    cache: QueryEmbeddingCache = QUERY_EMBEDDING_CACHE,
+) -> Callable:
+    """
+    Wrap an embedding function so its results are served from the cache
+
+    For batch (list) inputs only the texts missing from the cache are sent
+    to the embedding function, in a single call.
+
+    Args:
+        embedding_function: Function called as embedding_function(text, prefix)
+        model: Embedding model name, part of the cache key
+        cache: Cache to read from and store into
+
+    Returns:
+        Embedding function with the same call signature
+    """
+
+    def embed(text, prefix=None, *args, **kwargs):
+        if isinstance(text, list):
+            keys = [cache.make_key(model, t, prefix) for t in text]
+            vectors = [cache.get(key) for key in keys]
+            missing = [i for i, vector in enumerate(vectors) if vector is None]
+            if missing:
+                embedded = embedding_function(
+                    [text[i] for i in missing], prefix, *args, **kwargs
+                )
+                for i, vector in zip(missing, embedded):
+                    vectors[i] = vector
+                    if vector is not None:
+                        cache.put(keys[i], vector)
+            return vectors
+
+        if not isinstance(text, str):
+            return embedding_function(text, prefix, *args, **kwargs)
+
+        key = cache.make_key(model, text, prefix)
+        vector = cache.get(key)
+        if vector is None:
+            vector = embedding_function(text, prefix, *args, **kwargs)
+            if vector is not None:
+                cache.put(key, vector)
+        return vector
+
+    return embed
@@ -0,0 +1,145 @@
+"""
+Query Cache Module for Friday
+
+This module provides a bounded, thread-safe LRU cache with per-entry TTL
+used to memoize unified search results for repeated queries.
+
+Entries are invalidated lazily through version counters: bumping the
+version for a user (or the global version) changes the cache keys that
+are generated afterwards, so stale entries are never hit again and age
+out through LRU eviction or TTL expiry.
+
+Author: Friday AI
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional
+
+# Maximum number of cached entries before the least recently used is evicted
+QUERY_CACHE_MAX_SIZE = 2000
+
+# Lifetime of a cached entry in seconds
+QUERY_CACHE_TTL = 300
+
+# Lifetime of a cached per-user knowledge base collection list in seconds
+USER_COLLECTIONS_CACHE_TTL = 30
+
+
+class QueryCache:
+    """LRU cache with per-entry expiry, guarded by a re-entrant lock"""
+
+    def __init__(
+        self, max_size: int = QUERY_CACHE_MAX_SIZE, ttl: float = QUERY_CACHE_TTL
+    ):
+        self.max_size = max_size
+        self.ttl = ttl
+        self._entries: "OrderedDict[Hashable, tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._global_version = 0
+        self._user_versions: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def make_key(self, user_id: str, *parts: Any) -> str:
+        """
+        Build a cache key for a user and the given query parameters
+
+        The current global and per-user versions are mixed into the key so
+        that bumping either one invalidates every previously stored entry.
+
+        Args:
+            user_id: User ID the cached value belongs to
+            *parts: Query parameters that identify the cached value
+
+        Returns:
+            Hex digest usable as a cache key
+        """
+        with self._lock:
+            versions = (self._global_version, self._user_versions.get(user_id, 0))
+
+        raw = "|".join(str(p) for p in (*versions, user_id, *parts))
+        return hashlib.blake2b(raw.encode(), digest_size=16).hexdigest()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Return the cached value for key, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[key]
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        """Store value under key, evicting the least recently used entries"""
+        with self._lock:
+            self._entries[key] = (time.monotonic() + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def bump_version(self, user_id: Optional[str] = None) -> None:
+        """
+        Invalidate cached entries
+
+        Args:
+            user_id: Invalidate only this user's entries; when None, every
+                entry is invalidated (e.g. a shared knowledge base changed)
+        """
+        with self._lock:
+            if user_id is None:
+                self._global_version += 1
+            else:
+                self._user_versions[user_id] = self._user_versions.get(user_id, 0) + 1
+
+    def bump_versions(self, user_ids: Optional[Iterable[str]]) -> None:
+        """Invalidate cached entries of the given users, or of everyone when None"""
+        if user_ids is None:
+            self.bump_version()
+            return
+
+        for user_id in user_ids:
+            self.bump_version(user_id)
+
+    def clear(self) -> None:
+        """Drop all cached entries"""
+        with self._lock:
+            self._entries.clear()
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return cache size and hit/miss/eviction counters"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+
+# Shared cache for unified search results
+UNIFIED_SEARCH_CACHE = QueryCache()
+
+# Shared cache for the knowledge base collections each user can access
+USER_COLLECTIONS_CACHE = QueryCache(max_size=10_000, ttl=USER_COLLECTIONS_CACHE_TTL)
+
+
+def invalidate_user_collections(user_id: Optional[str] = None) -> None:
+    """Drop cached collection lists for a user, or for every user when None"""
+    USER_COLLECTIONS_CACHE.bump_version(user_id)
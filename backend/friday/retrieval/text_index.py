@@ -0,0 +1,267 @@
+"""
+Text Index Module for Friday
+
+This module provides a small in-memory BM25 inverted index used to rank
+a user's notes and prompts without scanning every document per query,
+together with a per-user cache for the built indexes.
+
+Author: Friday AI
+"""
+
+import heapq
+import math
+import re
+import threading
+import time
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# Lifetime of a cached per-user index in seconds
+TEXT_INDEX_TTL = 60
+
+# Corpus size above which query scoring switches to vectorized NumPy arrays
+VECTORIZE_MIN_DOCS = 200
+
+_TOKEN_RE = re.compile(r"\w+")
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase word tokens"""
+    return _TOKEN_RE.findall(text.lower()) if text else []
+
+
+@lru_cache(maxsize=1024)
+def tokenize_query(query: str) -> Tuple[str, ...]:
+    """
+    Tokenize a search query into its distinct tokens
+
+    Memoized because the same query is ranked against several indexes
+    (notes and prompts) and is often repeated across requests.
+    """
+    return tuple(dict.fromkeys(tokenize(query)))
+
+
+class BM25Index:
+    """Okapi BM25 scorer over an inverted index of token postings"""
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings: Dict[str, List[Tuple[str, int]]] = {}
+        self.doc_len: Dict[str, int] = {}
+        self.avgdl = 0.0
+        self.idf: Dict[str, float] = {}
+
+        # Array form of the postings, only built for large corpora
+        self.doc_ids: List[str] = []
+        self.array_postings: Dict[str, Tuple[np.ndarray, np.ndarray]] = {}
+
+    @classmethod
+    def build(cls, docs: Iterable[Tuple[str, str]], **kwargs) -> "BM25Index":
+        """
+        Build an index from documents
+
+        Args:
+            docs: Iterable of (doc_id, text) pairs
+
+        Returns:
+            Populated BM25Index
+        """
+        index = cls(**kwargs)
+
+        for doc_id, text in docs:
+            tokens = tokenize(text)
+            if not tokens:
+                # Empty documents can never match; keep them out of the statistics
+                continue
+            index.doc_len[doc_id] = len(tokens)
+
+            term_freqs: Dict[str, int] = {}
+            for token in tokens:
+                term_freqs[token] = term_freqs.get(token, 0) + 1
+            for token, tf in term_freqs.items():
+                index.postings.setdefault(token, []).append((doc_id, tf))
+
+        n_docs = len(index.doc_len)
+        if n_docs:
+            index.avgdl = sum(index.doc_len.values()) / n_docs
+        for token, postings in index.postings.items():
+            df = len(postings)
+            index.idf[token] = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+
+        if n_docs > VECTORIZE_MIN_DOCS:
+            index._build_arrays()
+
+        return index
+
+    def _build_arrays(self) -> None:
+        """
+        Convert postings to (doc index, term weight) arrays
+
+        The BM25 term weight only depends on tf and document length, so it is
+        computed once here and a query reduces to a scaled scatter-add.
+        """
+        self.doc_ids = list(self.doc_len)
+        positions = {doc_id: i for i, doc_id in enumerate(self.doc_ids)}
+        doc_len = np.fromiter(
+            self.doc_len.values(), dtype=np.float32, count=len(self.doc_ids)
+        )
+
+        for token, postings in self.postings.items():
+            idx = np.fromiter(
+                (positions[d] for d, _ in postings), dtype=np.int32, count=len(postings)
+            )
+            tf = np.fromiter(
+                (tf for _, tf in postings), dtype=np.float32, count=len(postings)
+            )
+            norm = self.k1 * (1 - self.b + self.b * doc_len[idx] / self.avgdl)
+            self.array_postings[token] = (idx, tf * (self.k1 + 1) / (tf + norm))
+
+    def _query_idf(self, token: str) -> float:
+        """IDF of a query token, treating tokens absent from the corpus as df=0"""
+        idf = self.idf.get(token)
+        if idf is None:
+            idf = math.log(1 + (len(self.doc_len) + 0.5) / 0.5)
+        return idf
+
+    def query(self, tokens: Iterable[str], k: int) -> List[Tuple[str, float]]:
+        """
+        Rank documents for the given query tokens
+
+        Scores fall in the [0, 1] range like the other search sources: each
+        document's BM25 score is taken relative to the best BM25 score for the
+        query, then scaled by the share of the query's IDF weight it matches.
+        Query terms missing from the corpus still count towards that weight, so
+        the best document only scores 1.0 when it contains every query term,
+        while one matching only a common term scores low even when it is the
+        best available.
+
+        Args:
+            tokens: Query tokens (already lowercased)
+            k: Number of results to return
+
+        Returns:
+            List of (doc_id, score) pairs, best first
+        """
+        if self.array_postings:
+            return self._query_arrays(tokens, k)
+
+        scores: Dict[str, float] = {}
+        matched_idf: Dict[str, float] = {}
+        query_idf = 0.0
+
+        for token in set(tokens):
+            query_idf += self._query_idf(token)
+            postings = self.postings.get(token)
+            if not postings:
+                continue
+
+            idf = self.idf[token]
+            for doc_id, tf in postings:
+                norm = self.k1 * (
+                    1 - self.b + self.b * self.doc_len[doc_id] / self.avgdl
+                )
+                weight = tf * (self.k1 + 1) / (tf + norm)
+                scores[doc_id] = scores.get(doc_id, 0.0) + idf * weight
+                matched_idf[doc_id] = matched_idf.get(doc_id, 0.0) + idf
+
+        if not scores or k <= 0:
+            return []
+
+        scale = max(scores.values()) * query_idf
+        normalized = (
+            (doc_id, score * matched_idf[doc_id] / scale)
+            for doc_id, score in scores.items()
+        )
+        return heapq.nlargest(k, normalized, key=lambda x: x[1])
+
+    def _query_arrays(self, tokens: Iterable[str], k: int) -> List[Tuple[str, float]]:
+        """Vectorized equivalent of query for indexes with array postings"""
+        scores = np.zeros(len(self.doc_ids), dtype=np.float32)
+        matched_idf = np.zeros(len(self.doc_ids), dtype=np.float32)
+        query_idf = 0.0
+
+        for token in set(tokens):
+            query_idf += self._query_idf(token)
+            postings = self.array_postings.get(token)
+            if postings is None:
+                continue
+
+            idx, weights = postings
+            idf = self.idf[token]
+            scores[idx] += idf * weights
+            matched_idf[idx] += idf
+
+        hits = np.flatnonzero(scores)
+        if not hits.size or k <= 0:
+            return []
+
+        normalized = scores[hits] * matched_idf[hits] / (scores[hits].max() * query_idf)
+        if hits.size > k:
+            best = np.argpartition(-normalized, k - 1)[:k]
+            hits, normalized = hits[best], normalized[best]
+        order = np.argsort(-normalized)
+
+        return [(self.doc_ids[hits[i]], float(normalized[i])) for i in order]
+
+
+class TextIndexCache:
+    """Per-user cache of built indexes with TTL and global or per-user invalidation"""
+
+    def __init__(self, ttl: float = TEXT_INDEX_TTL):
+        self.ttl = ttl
+        self.version = 0
+        self._user_versions: Dict[str, int] = {}
+        self._entries: Dict[str, Tuple[float, Tuple[int, int], Any]] = {}
+        self._lock = threading.RLock()
+
+    def get_version(self, user_id: str) -> Tuple[int, int]:
+        """Return the current (global, per-user) version for a user"""
+        with self._lock:
+            return self.version, self._user_versions.get(user_id, 0)
+
+    def get(self, user_id: str) -> Optional[Any]:
+        """Return the cached value for a user, or None if missing or stale"""
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+
+            expires_at, version, value = entry
+            if version != self.get_version(user_id) or expires_at <= time.monotonic():
+                del self._entries[user_id]
+                return None
+            return value
+
+    def put(self, user_id: str, value: Any, version: Tuple[int, int]) -> None:
+        """
+        Store a value built while the user's cache was at the given version
+
+        Values built before an invalidation are discarded on the next get.
+        """
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + self.ttl, version, value)
+
+    def invalidate(self, user_ids: Optional[Iterable[str]] = None) -> None:
+        """
+        Mark cached indexes as stale
+
+        Args:
+            user_ids: Invalidate only these users' indexes; when None, every
+                index is invalidated
+        """
+        with self._lock:
+            if user_ids is None:
+                self.version += 1
+                self._entries.clear()
+                return
+
+            for user_id in user_ids:
+                self._user_versions[user_id] = self._user_versions.get(user_id, 0) + 1
+                self._entries.pop(user_id, None)
+
+
+NOTES_INDEX_CACHE = TextIndexCache()
+PROMPTS_INDEX_CACHE = TextIndexCache()
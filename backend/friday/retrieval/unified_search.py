@@ -10,21 +10,92 @@ implementing the priority-based search strategy:
 Author: Friday AI
 """
 
-from typing import List, Optional, Dict, Any
+import asyncio
+import copy
+import hashlib
+import heapq
+import io
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import List, Literal, Optional, Dict, Any
 from dataclasses import dataclass, field
 from loguru import logger
 
+import numpy as np
+import orjson
+
+from friday.config import RAG_EMBEDDING_QUERY_PREFIX
+from friday.env import DATABASE_POOL_SIZE
 from friday.models.knowledge import Knowledges
 from friday.models.memories import Memories
 from friday.models.notes import Notes
 from friday.models.prompts import Prompts
-from friday.models.groups import Groups
-from friday.utils.access_control import has_access
-from friday.retrieval.utils import query_collection, query_collection_with_hybrid_search
+from friday.retrieval.utils import query_collection_with_hybrid_search
+from friday.retrieval.embedding_cache import cached_embedding_function
 from friday.retrieval.vector.factory import VECTOR_DB_CLIENT
+from friday.retrieval.vector.main import VectorDBBase, VectorSearchResult
+from friday.retrieval.query_cache import UNIFIED_SEARCH_CACHE, USER_COLLECTIONS_CACHE
+from friday.retrieval.text_index import (
+    BM25Index,
+    NOTES_INDEX_CACHE,
+    PROMPTS_INDEX_CACHE,
+    tokenize_query,
+)
+
+
+# Shared pool for blocking vector DB calls so they don't stall the event loop
+_SEARCH_EXECUTOR = ThreadPoolExecutor(max_workers=32, thread_name_prefix="unified-search")
+
+# Pool for blocking SQL accessors, sized to the database connection pool so
+# worker threads don't queue on connection checkout
+_DB_EXECUTOR = ThreadPoolExecutor(
+    max_workers=(
+        DATABASE_POOL_SIZE
+        if isinstance(DATABASE_POOL_SIZE, int) and DATABASE_POOL_SIZE > 0
+        else 8
+    ),
+    thread_name_prefix="unified-search-db",
+)
+
+# Maximum number of notes/prompts fetched by the SQL prefilter while a user's index is cold
+FULLTEXT_CANDIDATE_LIMIT = 100
+
+# Maximum number of in-flight per-collection searches for a single query
+COLLECTION_SEARCH_CONCURRENCY = 8
+
+# Rank offset for Reciprocal Rank Fusion of per-collection results
+RRF_K = 60
+
+# Minimum room (in characters) worth filling with a truncated result in the LLM context
+MIN_TRUNCATED_CONTENT_LENGTH = 200
+
+# (kind, user_id) pairs whose text index is currently being built; the done
+# callbacks run on pool threads, so access goes through the lock
+_INDEX_BUILDS: set = set()
+_INDEX_BUILDS_LOCK = threading.Lock()
+
+
+_SEARCH_RESULT_FIELDS = ("content", "metadata", "score", "source", "source_name")
 
 
-@dataclass
+async def _run_blocking(executor: ThreadPoolExecutor, func, *args, **kwargs):
+    """Run a blocking call on the given pool without stalling the event loop"""
+    return await asyncio.get_running_loop().run_in_executor(
+        executor, partial(func, *args, **kwargs)
+    )
+
+
+def _json_default(value: Any) -> Any:
+    """Fallback encoder for metadata values orjson can't serialize natively"""
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    if isinstance(value, np.generic):
+        return value.item()
+    return str(value)
+
+
+@dataclass(slots=True)
 class SearchResult:
     """Individual search result from a knowledge base"""
 
@@ -36,16 +107,10 @@ class SearchResult:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
-        return {
-            "content": self.content,
-            "metadata": self.metadata,
-            "score": self.score,
-            "source": self.source,
-            "source_name": self.source_name,
-        }
+        return {f: getattr(self, f) for f in _SEARCH_RESULT_FIELDS}
 
 
-@dataclass
+@dataclass(slots=True)
 class UnifiedSearchResult:
     """Aggregated search results from unified search"""
 
@@ -56,11 +121,23 @@ class UnifiedSearchResult:
     query: str = ""
 
     def __post_init__(self):
-        """Calculate derived fields"""
-        self.total_count = len(self.results)
-        if self.results:
-            self.max_score = max(r.score for r in self.results)
-            self.sources = list(set(r.source for r in self.results))
+        """Calculate derived fields in a single pass, unless passed in precomputed"""
+        if self.total_count or not self.results:
+            return
+
+        total = 0
+        max_score = float("-inf")
+        sources = set()
+        for r in self.results:
+            total += 1
+            if r.score > max_score:
+                max_score = r.score
+            sources.add(r.source)
+
+        self.total_count = total
+        if total:
+            self.max_score = max_score
+            self.sources = list(sources)
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for serialization"""
@@ -72,11 +149,101 @@ class UnifiedSearchResult:
             "query": self.query,
         }
 
+    def to_json(self) -> bytes:
+        """Serialize straight to JSON, same shape as to_dict, without building dicts"""
+        return orjson.dumps(self, default=_json_default, option=orjson.OPT_SERIALIZE_NUMPY)
+
     def is_relevant(self, threshold: float) -> bool:
         """Check if results meet relevance threshold"""
         return self.max_score >= threshold if self.results else False
 
 
+def _convert_raw_results(
+    raw_results: List[Any], collection_names_map: Dict[str, str]
+) -> List[SearchResult]:
+    """
+    Convert knowledge base hits to SearchResult objects
+
+    Every hit in a batch has the same shape, so the format is detected once
+    from the first item and the matching loop runs without per-item checks.
+
+    Args:
+        raw_results: (source_id, score, document_dict) tuples, or dicts with
+            score/content/metadata/source keys
+        collection_names_map: Collection ID to knowledge base name
+
+    Returns:
+        List of SearchResult objects
+    """
+    names_get = collection_names_map.get
+
+    # The output size is known upfront, so allocate the list once
+    results: List[Optional[SearchResult]] = [None] * len(raw_results)
+    idx = 0
+
+    if isinstance(raw_results[0], tuple):
+        for source_id, score, document, *_ in raw_results:
+            metadata = document.get("metadata", {})
+            collection_id = metadata.get("collection_name", source_id)
+            results[idx] = SearchResult(
+                content=document.get("text", "") or document.get("content", ""),
+                metadata=metadata,
+                score=float(score) if isinstance(score, (int, float)) else 0.0,
+                source=collection_id,
+                source_name=names_get(collection_id, "Unknown"),
+            )
+            idx += 1
+    elif isinstance(raw_results[0], dict):
+        for item in raw_results:
+            metadata = item.get("metadata", {})
+            collection_id = metadata.get("collection_name", item.get("source", ""))
+            results[idx] = SearchResult(
+                content=item.get("content", "") or item.get("text", ""),
+                metadata=metadata,
+                score=float(item.get("score", 0.0)),
+                source=collection_id,
+                source_name=names_get(collection_id, "Unknown"),
+            )
+            idx += 1
+
+    # Trim the unused tail if the batch was in an unrecognized format
+    del results[idx:]
+    return results
+
+
+def _dedupe_results(results: List[SearchResult]) -> List[SearchResult]:
+    """
+    Collapse results with identical content, keeping the best-scoring copy
+
+    The same chunk can come back from several collections; duplicates
+    would otherwise take up top-k slots and context space.
+    """
+    seen: Dict[bytes, SearchResult] = {}
+    for result in results:
+        key = hashlib.blake2b(result.content.encode(), digest_size=16).digest()
+        existing = seen.get(key)
+        if existing is None or result.score > existing.score:
+            seen[key] = result
+    return list(seen.values())
+
+
+def _top_k(results: List[SearchResult], k: int) -> List[SearchResult]:
+    """
+    Select the k highest-scoring results, best first
+
+    Uses a linear-time partial selection and only sorts the k survivors.
+    """
+    if k <= 0:
+        return []
+    if len(results) <= k:
+        return sorted(results, key=lambda x: x.score, reverse=True)
+
+    scores = np.fromiter((r.score for r in results), dtype=np.float32, count=len(results))
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return [results[i] for i in top]
+
+
 async def get_all_user_collections(user_id: str, permission: str = "read") -> List[tuple]:
     """
     Get all collection IDs and names for a user's knowledge bases
@@ -91,14 +258,22 @@ async def get_all_user_collections(user_id: str, permission: str = "read") -> Li
     try:
         logger.debug(f"Getting all knowledge bases for user {user_id}")
 
+        cache_key = USER_COLLECTIONS_CACHE.make_key(user_id, permission)
+        cached = USER_COLLECTIONS_CACHE.get(cache_key)
+        if cached is not None:
+            return cached
+
         # Get all knowledge bases the user has access to
-        knowledge_bases = Knowledges.get_knowledge_bases_by_user_id(
+        knowledge_bases = await _run_blocking(
+            _DB_EXECUTOR,
+            Knowledges.get_knowledge_bases_by_user_id,
             user_id=user_id,
             permission=permission
         )
 
         if not knowledge_bases:
             logger.info(f"No knowledge bases found for user {user_id}")
+            USER_COLLECTIONS_CACHE.put(cache_key, [])
             return []
 
         # Each knowledge base ID IS the collection name
@@ -106,6 +281,7 @@ async def get_all_user_collections(user_id: str, permission: str = "read") -> Li
             (kb.id, kb.name)
             for kb in knowledge_bases
         ]
+        USER_COLLECTIONS_CACHE.put(cache_key, collections)
 
         logger.info(f"Found {len(collections)} collections for user {user_id}")
         return collections
@@ -128,13 +304,8 @@ async def get_collections_for_files(file_ids: List[str]) -> List[tuple]:
     try:
         logger.debug(f"Getting collections for {len(file_ids)} files")
 
-        collections = []
-
         # For individual files, the collection name is f"file-{file_id}"
-        for file_id in file_ids:
-            # Try modern format first
-            collection_name = f"file-{file_id}"
-            collections.append((collection_name, file_id))
+        collections = [(f"file-{file_id}", file_id) for file_id in file_ids]
 
         logger.info(f"Mapped {len(collections)} files to collections")
         return collections
@@ -144,94 +315,274 @@ async def get_collections_for_files(file_ids: List[str]) -> List[tuple]:
         return []
 
 
-async def search_collections(
-    collection_names: List[str],
-    query: str,
-    embedding_function,
-    k: int = 5,
-    r: float = 0.0,
-) -> List[Dict[str, Any]]:
+def _reuse_query_embedding(embedding_function, query: str, query_embedding: List[float]):
     """
-    Search across multiple collections using vector search
+    Wrap an embedding function so that embedding the search query returns a
+    precomputed vector instead of calling the embedding backend again
 
     Args:
-        collection_names: List of collection IDs to search
-        query: Search query text
         embedding_function: Function to generate embeddings
-        k: Number of results per collection
-        r: Relevance threshold
+        query: Search query text the vector was computed for
+        query_embedding: Precomputed embedding of query
 
     Returns:
-        List of search results with scores
+        Embedding function with the same call signature
     """
-    try:
-        if not collection_names:
-            logger.warning("No collections provided for search")
-            return []
 
-        logger.debug(f"Searching {len(collection_names)} collections for: {query}")
+    def wrapped(texts, prefix=None):
+        if prefix == RAG_EMBEDDING_QUERY_PREFIX:
+            if isinstance(texts, str) and texts == query:
+                return query_embedding
+            if isinstance(texts, list) and all(t == query for t in texts):
+                return [query_embedding] * len(texts)
+        return embedding_function(texts, prefix)
 
-        # Use existing query_collection function from retrieval/utils.py
-        results = query_collection(
+    return wrapped
+
+
+async def _batch_search(
+    collection_names: List[str],
+    vectors: List[List[float]],
+    limit: int,
+    metadata_filter: Optional[Dict[str, Any]] = None,
+) -> List[Any]:
+    """
+    Search several collections concurrently off the event loop
+
+    Uses the backend's native batch_search when it overrides the
+    VectorDBBase hook, otherwise issues one search per collection on the
+    shared thread pool.
+
+    Returns:
+        One search result (or None) per collection, in input order
+    """
+    if type(VECTOR_DB_CLIENT).batch_search is not VectorDBBase.batch_search:
+        return await _run_blocking(
+            _SEARCH_EXECUTOR,
+            VECTOR_DB_CLIENT.batch_search,
             collection_names=collection_names,
-            queries=[query],
-            embedding_function=embedding_function,
-            k=k,
-            r=r,
+            vectors=vectors,
+            limit=limit,
+            filter=metadata_filter,
         )
 
-        logger.info(f"Found {len(results)} raw results from collections")
-        return results
+    # Bound the fan-out so one user with many collections can't flood the vector DB
+    semaphore = asyncio.Semaphore(COLLECTION_SEARCH_CONCURRENCY)
+
+    async def search_one(collection_name: str):
+        async with semaphore:
+            return await _run_blocking(
+                _SEARCH_EXECUTOR,
+                VECTOR_DB_CLIENT.search,
+                collection_name=collection_name,
+                vectors=vectors,
+                limit=limit,
+                filter=metadata_filter,
+            )
 
-    except Exception as e:
-        logger.error(f"Error searching collections: {e}")
-        return []
+    results = await asyncio.gather(
+        *[search_one(collection_name) for collection_name in collection_names],
+        return_exceptions=True,
+    )
 
+    for collection_name, result in zip(collection_names, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error searching collection {collection_name}: {result}")
 
-async def search_collections_hybrid(
+    return [None if isinstance(result, Exception) else result for result in results]
+
+
+async def _batch_hybrid_search(
+    collection_names: List[str],
+    query: str,
+    embedding_function,
+    k: int,
+    r: float,
+    bm25_weight: float,
+    reranking_function,
+    k_reranker: int,
+) -> List[Optional[dict]]:
+    """
+    Hybrid-search several collections concurrently off the event loop
+
+    Each collection is searched on its own so hits stay attributable to
+    the collection they came from.
+
+    Returns:
+        One query result dict (or None) per collection, in input order
+    """
+    semaphore = asyncio.Semaphore(COLLECTION_SEARCH_CONCURRENCY)
+
+    async def search_one(collection_name: str):
+        async with semaphore:
+            return await _run_blocking(
+                _SEARCH_EXECUTOR,
+                query_collection_with_hybrid_search,
+                collection_names=[collection_name],
+                queries=[query],
+                embedding_function=embedding_function,
+                k=k,
+                reranking_function=reranking_function,
+                k_reranker=k_reranker,
+                r=r,
+                hybrid_bm25_weight=bm25_weight,
+            )
+
+    results = await asyncio.gather(
+        *[search_one(collection_name) for collection_name in collection_names],
+        return_exceptions=True,
+    )
+
+    for collection_name, result in zip(collection_names, results):
+        if isinstance(result, Exception):
+            logger.error(f"Error in hybrid search of collection {collection_name}: {result}")
+
+    return [None if isinstance(result, Exception) else result for result in results]
+
+
+async def search_collections(
     collection_names: List[str],
     query: str,
     embedding_function,
     k: int = 5,
     r: float = 0.0,
+    query_embedding: Optional[List[float]] = None,
+    metadata_filter: Optional[Dict[str, Any]] = None,
+    mode: Literal["vector", "hybrid"] = "vector",
     bm25_weight: float = 0.5,
-) -> List[Dict[str, Any]]:
+    reranking_function=None,
+    k_reranker: int = 3,
+) -> List[tuple]:
     """
-    Search across multiple collections using hybrid search (BM25 + vector)
+    Search across multiple collections using vector or hybrid (BM25 + vector) search
 
     Args:
         collection_names: List of collection IDs to search
         query: Search query text
         embedding_function: Function to generate embeddings
-        k: Number of results per collection
+        k: Number of results to return
         r: Relevance threshold
-        bm25_weight: Weight for BM25 scoring (0.0 = pure vector, 1.0 = pure BM25)
+        query_embedding: Precomputed query embedding to reuse
+        metadata_filter: Metadata filter pushed down to the vector DB (vector mode only)
+        mode: "vector" for pure vector search, "hybrid" for BM25 + vector
+        bm25_weight: Weight for BM25 scoring in hybrid mode (0.0 = pure vector, 1.0 = pure BM25)
+        reranking_function: Optional reranking function for hybrid mode
+        k_reranker: Number of results kept by the reranker in hybrid mode
 
     Returns:
-        List of search results with hybrid scores
+        List of (collection_id, score, document) tuples, in fused rank order
     """
     try:
         if not collection_names:
-            logger.warning("No collections provided for hybrid search")
+            logger.warning("No collections provided for search")
             return []
 
-        logger.debug(f"Hybrid searching {len(collection_names)} collections for: {query}")
+        logger.debug(f"Searching {len(collection_names)} collections ({mode}) for: {query}")
 
-        # Use existing hybrid search function
-        results = query_collection_with_hybrid_search(
-            collection_names=collection_names,
-            queries=[query],
-            embedding_function=embedding_function,
-            k=k,
-            r=r,
-            hybrid_weight=bm25_weight,
-        )
+        if query_embedding is None:
+            query_embedding = await _run_blocking(
+                _SEARCH_EXECUTOR, embedding_function, query, RAG_EMBEDDING_QUERY_PREFIX
+            )
+
+        def vector_hits(result):
+            if result and result.ids and result.ids[0]:
+                return result.documents[0], result.metadatas[0], result.distances[0]
+            return None
+
+        # Query every collection concurrently, normalizing each result to
+        # (documents, metadatas, scores)
+        if mode == "hybrid":
+            batch_results = await _batch_hybrid_search(
+                collection_names=collection_names,
+                query=query,
+                embedding_function=_reuse_query_embedding(
+                    embedding_function, query, query_embedding
+                ),
+                k=k,
+                r=r,
+                bm25_weight=bm25_weight,
+                reranking_function=reranking_function,
+                k_reranker=k_reranker,
+            )
+            hits = [
+                (result["documents"][0], result["metadatas"][0], result["distances"][0])
+                if result and result.get("documents") and result["documents"][0]
+                else None
+                for result in batch_results
+            ]
+
+            # Retry collections whose hybrid search failed with plain vector
+            # search, so hybrid mode never returns less than vector mode
+            failed = [i for i, result in enumerate(batch_results) if result is None]
+            if failed:
+                logger.warning(
+                    f"Hybrid search failed for {len(failed)} collections, using vector search"
+                )
+                fallback = await _batch_search(
+                    collection_names=[collection_names[i] for i in failed],
+                    vectors=[query_embedding],
+                    limit=k,
+                    metadata_filter=metadata_filter,
+                )
+                for i, result in zip(failed, fallback):
+                    hits[i] = vector_hits(result)
+        else:
+            batch_results = await _batch_search(
+                collection_names=collection_names,
+                vectors=[query_embedding],
+                limit=k,
+                metadata_filter=metadata_filter,
+            )
+            hits = [vector_hits(result) for result in batch_results]
+
+        # Fuse the per-collection rankings with Reciprocal Rank Fusion: raw
+        # scores from different collections aren't directly comparable, ranks are.
+        # Entries are [rrf_score, best_score, collection_name, document, metadata]
+        fused: Dict[bytes, list] = {}
+        for collection_name, collection_hits in zip(collection_names, hits):
+            if collection_hits is None:
+                continue
+
+            documents, metadatas, distances = collection_hits
+            scores = np.asarray(
+                [d if d is not None else 0.0 for d in distances], dtype=np.float64
+            )
+
+            # Rank best first, dropping hits below the relevance threshold
+            order = np.argsort(-scores, kind="stable")
+            order = order[scores[order] >= r]
+            for rank, i in enumerate(order.tolist(), 1):
+                score = float(scores[i])
+                key = hashlib.blake2b(documents[i].encode(), digest_size=16).digest()
+                entry = fused.get(key)
+                if entry is None:
+                    fused[key] = [
+                        1.0 / (RRF_K + rank), score, collection_name, documents[i], metadatas[i]
+                    ]
+                    continue
+
+                entry[0] += 1.0 / (RRF_K + rank)
+                if score > entry[1]:
+                    entry[1:] = [score, collection_name, documents[i], metadatas[i]]
+
+        # Keep the original similarity as the score so it stays comparable with
+        # the other sources; the fused score is kept in the metadata
+        results = [
+            (
+                collection_name,
+                score,
+                {"text": document, "metadata": {**(metadata or {}), "rrf_score": rrf_score}},
+            )
+            for rrf_score, score, collection_name, document, metadata in heapq.nlargest(
+                k, fused.values(), key=lambda x: (x[0], x[1])
+            )
+        ]
 
-        logger.info(f"Found {len(results)} hybrid search results")
+        logger.info(f"Found {len(results)} raw results from collections")
         return results
 
     except Exception as e:
-        logger.error(f"Error in hybrid search: {e}")
+        logger.error(f"Error searching collections: {e}")
         return []
 
 
@@ -240,6 +591,8 @@ async def search_memories(
     query: str,
     embedding_function,
     k: int = 3,
+    query_embedding: Optional[List[float]] = None,
+    memories: Optional[list] = None,
 ) -> List[SearchResult]:
     """
     Search user's memories using vector similarity
@@ -249,6 +602,8 @@ async def search_memories(
         query: Search query text
         embedding_function: Function to generate embeddings
         k: Number of results to retrieve
+        query_embedding: Precomputed query embedding to reuse
+        memories: User's memories if already fetched by the caller
 
     Returns:
         List of SearchResult objects from memories
@@ -257,7 +612,10 @@ async def search_memories(
         collection_name = f"user-memory-{user_id}"
 
         # Check if user has any memories first
-        memories = Memories.get_memories_by_user_id(user_id)
+        if memories is None:
+            memories = await _run_blocking(
+                _DB_EXECUTOR, Memories.get_memories_by_user_id, user_id
+            )
         if not memories:
             logger.debug(f"No memories found for user {user_id}")
             return []
@@ -265,37 +623,40 @@ async def search_memories(
         logger.debug(f"Searching memories for user {user_id}: {query}")
 
         # Perform vector search on memory collection
-        query_embedding = embedding_function(query)
+        if query_embedding is None:
+            query_embedding = await _run_blocking(
+                _SEARCH_EXECUTOR, embedding_function, query, RAG_EMBEDDING_QUERY_PREFIX
+            )
 
-        results = VECTOR_DB_CLIENT.search(
+        results: Optional[VectorSearchResult] = await _run_blocking(
+            _SEARCH_EXECUTOR,
+            VECTOR_DB_CLIENT.search,
             collection_name=collection_name,
             vectors=[query_embedding],
             limit=k,
         )
+        if not results or not results.ids or not results.ids[0]:
+            logger.info("Found 0 memory results")
+            return []
 
-        search_results = []
+        documents = results.documents[0]
+        metadatas = results.metadatas[0]
+
+        # The vector DB client already normalizes distances to 0-1 similarity
+        # scores (1.0 = perfect match); clamp them in one vectorized pass
+        scores = np.clip(
+            np.asarray(results.distances[0], dtype=np.float32), 0.0, 1.0
+        ).tolist()
 
-        if results and hasattr(results, 'ids') and results.ids and len(results.ids) > 0:
-            ids = results.ids[0]
-            documents = results.documents[0]
-            metadatas = results.metadatas[0]
-            distances = results.distances[0]
-
-            for i in range(len(ids)):
-                # Vector DB returns distance, convert to similarity score
-                # ChromaDB with cosine similarity: distance = 1 - cosine_similarity
-                # So: similarity = 1 - distance
-                # Clamp to [0, 1] range
-                distance = distances[i]
-                score = max(0.0, min(1.0, 1.0 - distance))
-
-                search_results.append(SearchResult(
-                    content=documents[i],
-                    metadata=metadatas[i],
-                    score=score,
-                    source=collection_name,
-                    source_name="Memories",
-                ))
+        search_results = []
+        for i, document in enumerate(documents):
+            search_results.append(SearchResult(
+                content=document,
+                metadata=metadatas[i],
+                score=scores[i],
+                source=collection_name,
+                source_name="Memories",
+            ))
 
         if search_results:
             max_score = max(r.score for r in search_results)
@@ -309,13 +670,97 @@ async def search_memories(
         return []
 
 
+def _get_note_content(note) -> str:
+    """Extract the text content stored in a note's data"""
+    if note.data and isinstance(note.data, dict):
+        content_data = note.data.get("content", {})
+        if isinstance(content_data, dict):
+            return content_data.get("md", "") or content_data.get("text", "")
+        elif isinstance(content_data, str):
+            return content_data
+    return ""
+
+
+def _build_notes_index(notes) -> tuple:
+    """
+    Build a BM25 index over notes
+
+    Returns:
+        Tuple of (BM25Index, {note_id: (note, content)})
+    """
+    docs = {note.id: (note, _get_note_content(note)) for note in notes}
+    index = BM25Index.build(
+        (note_id, f"{note.title or ''}\n{content}")
+        for note_id, (note, content) in docs.items()
+    )
+    return index, docs
+
+
+def _build_prompts_index(prompts) -> tuple:
+    """
+    Build a BM25 index over prompts
+
+    Returns:
+        Tuple of (BM25Index, {command: prompt})
+    """
+    docs = {prompt.command: prompt for prompt in prompts}
+    index = BM25Index.build(
+        (prompt.command, f"{prompt.command}\n{prompt.title or ''}\n{prompt.content or ''}")
+        for prompt in prompts
+    )
+    return index, docs
+
+
+def _get_notes_index(user_id: str) -> tuple:
+    """Get the cached BM25 index over the notes a user can read, building it on a miss"""
+    cached = NOTES_INDEX_CACHE.get(user_id)
+    if cached is not None:
+        return cached
+
+    version = NOTES_INDEX_CACHE.get_version(user_id)
+    result = _build_notes_index(Notes.get_notes_by_permission(user_id, permission="read"))
+    NOTES_INDEX_CACHE.put(user_id, result, version)
+    return result
+
+
+def _get_prompts_index(user_id: str) -> tuple:
+    """Get the cached BM25 index over the prompts a user can read, building it on a miss"""
+    cached = PROMPTS_INDEX_CACHE.get(user_id)
+    if cached is not None:
+        return cached
+
+    version = PROMPTS_INDEX_CACHE.get_version(user_id)
+    result = _build_prompts_index(Prompts.get_prompts_by_user_id(user_id, permission="read"))
+    PROMPTS_INDEX_CACHE.put(user_id, result, version)
+    return result
+
+
+def _warm_index(kind: str, user_id: str, loader) -> None:
+    """Build a user's text index on the database pool, at most once at a time"""
+    key = (kind, user_id)
+    with _INDEX_BUILDS_LOCK:
+        if key in _INDEX_BUILDS:
+            return
+        _INDEX_BUILDS.add(key)
+
+    def _done(_):
+        with _INDEX_BUILDS_LOCK:
+            _INDEX_BUILDS.discard(key)
+
+    try:
+        _DB_EXECUTOR.submit(loader, user_id).add_done_callback(_done)
+    except Exception:
+        _done(None)
+        raise
+
+
 async def search_notes(
     user_id: str,
     query: str,
     k: int = 3,
 ) -> List[SearchResult]:
     """
-    Search user's notes using text matching
+    Search user's notes using BM25 text ranking
 
     Args:
         user_id: User ID to search notes for
@@ -328,57 +773,39 @@ async def search_notes(
     try:
         logger.debug(f"Searching notes for user {user_id}: {query}")
 
-        # Get notes the user has access to
-        user_groups = Groups.get_groups_by_member_id(user_id)
-        user_group_ids = {group.id for group in user_groups}
-        notes = Notes.get_notes_by_permission(user_id, permission="read")
+        # Use the cached index over all readable notes when it is warm;
+        # otherwise rank SQL-prefiltered candidates and warm it in the background.
+        # IDF on the cold path only comes from those candidates, so absolute
+        # scores can shift once the full index is warm. Scores are relative
+        # to the best match, though, so the top hit stays comparable
+        cached = NOTES_INDEX_CACHE.get(user_id)
+        if cached is not None:
+            index, docs = cached
+        else:
+            _warm_index("notes", user_id, _get_notes_index)
+            index, docs = _build_notes_index(
+                await _run_blocking(
+                    _DB_EXECUTOR,
+                    Notes.search_notes_fulltext,
+                    user_id,
+                    query,
+                    permission="read",
+                    limit=FULLTEXT_CANDIDATE_LIMIT,
+                )
+            )
 
-        if not notes:
+        if not docs:
             logger.debug(f"No notes found for user {user_id}")
             return []
 
-        # Simple text matching on title and content
-        query_lower = query.lower()
-        scored_notes = []
-
-        for note in notes:
-            score = 0.0
-            title = note.title.lower() if note.title else ""
-
-            # Get content from note data
-            content = ""
-            if note.data and isinstance(note.data, dict):
-                content_data = note.data.get("content", {})
-                if isinstance(content_data, dict):
-                    content = content_data.get("md", "") or content_data.get("text", "")
-                elif isinstance(content_data, str):
-                    content = content_data
-            content_lower = content.lower()
-
-            # Score based on exact match, word match, and contains
-            if query_lower in title:
-                score += 1.0
-            elif any(word in title for word in query_lower.split()):
-                score += 0.5
-
-            if query_lower in content_lower:
-                score += 0.7
-            elif any(word in content_lower for word in query_lower.split()):
-                score += 0.3
-
-            if score > 0:
-                # Include both title and snippet of content
-                content_snippet = content[:500] if content else title
-                full_text = f"{title}\n\n{content_snippet}" if content else title
-
-                scored_notes.append((note, score, full_text))
-
-        # Sort by score and take top k
-        scored_notes.sort(key=lambda x: x[1], reverse=True)
-        top_notes = scored_notes[:k]
-
         search_results = []
-        for note, score, content_text in top_notes:
+        for note_id, score in index.query(tokenize_query(query), k):
+            note, content = docs[note_id]
+            title = note.title or ""
+
+            # Include both title and snippet of content
+            content_text = f"{title}\n\n{content[:500]}" if content else title
+
             search_results.append(SearchResult(
                 content=content_text,
                 metadata={
@@ -405,7 +832,7 @@ async def search_prompts(
     k: int = 3,
 ) -> List[SearchResult]:
     """
-    Search user's prompts using text matching
+    Search user's prompts using BM25 text ranking
 
     Args:
         user_id: User ID to search prompts for
@@ -418,52 +845,39 @@ async def search_prompts(
     try:
         logger.debug(f"Searching prompts for user {user_id}: {query}")
 
-        # Get prompts the user has access to
-        prompts = Prompts.get_prompts_by_user_id(user_id, permission="read")
+        # Use the cached index over all readable prompts when it is warm;
+        # otherwise rank SQL-prefiltered candidates and warm it in the background.
+        # IDF on the cold path only comes from those candidates, so absolute
+        # scores can shift once the full index is warm. Scores are relative
+        # to the best match, though, so the top hit stays comparable
+        cached = PROMPTS_INDEX_CACHE.get(user_id)
+        if cached is not None:
+            index, docs = cached
+        else:
+            _warm_index("prompts", user_id, _get_prompts_index)
+            index, docs = _build_prompts_index(
+                await _run_blocking(
+                    _DB_EXECUTOR,
+                    Prompts.search_prompts_fulltext,
+                    user_id,
+                    query,
+                    permission="read",
+                    limit=FULLTEXT_CANDIDATE_LIMIT,
+                )
+            )
 
-        if not prompts:
+        if not docs:
             logger.debug(f"No prompts found for user {user_id}")
             return []
 
-        # Simple text matching on command, title, and content
-        query_lower = query.lower()
-        scored_prompts = []
-
-        for prompt in prompts:
-            score = 0.0
-            command = prompt.command.lower() if prompt.command else ""
-            title = prompt.title.lower() if prompt.title else ""
-            content = prompt.content.lower() if prompt.content else ""
-
-            # Score based on matches
-            if query_lower in command:
-                score += 1.0
-            elif any(word in command for word in query_lower.split()):
-                score += 0.6
-
-            if query_lower in title:
-                score += 0.8
-            elif any(word in title for word in query_lower.split()):
-                score += 0.4
-
-            if query_lower in content:
-                score += 0.6
-            elif any(word in content for word in query_lower.split()):
-                score += 0.2
-
-            if score > 0:
-                # Include command, title, and snippet of content
-                content_snippet = prompt.content[:500] if prompt.content else ""
-                full_text = f"/{prompt.command}: {prompt.title}\n\n{content_snippet}"
-
-                scored_prompts.append((prompt, score, full_text))
+        search_results = []
+        for command, score in index.query(tokenize_query(query), k):
+            prompt = docs[command]
 
-        # Sort by score and take top k
-        scored_prompts.sort(key=lambda x: x[1], reverse=True)
-        top_prompts = scored_prompts[:k]
+            # Include command, title, and snippet of content
+            content_snippet = prompt.content[:500] if prompt.content else ""
+            content_text = f"/{prompt.command}: {prompt.title}\n\n{content_snippet}"
 
-        search_results = []
-        for prompt, score, content_text in top_prompts:
             search_results.append(SearchResult(
                 content=content_text,
                 metadata={
@@ -495,6 +909,8 @@ async def unified_search(
     k_reranker: int = 3,
     r: float = 0.0,
     hybrid_bm25_weight: float = 0.5,
+    embedding_model: Optional[str] = None,
+    metadata_filter: Optional[Dict[str, Any]] = None,
 ) -> UnifiedSearchResult:
     """
     Perform unified search across all user's knowledge sources
@@ -519,6 +935,10 @@ async def unified_search(
         k_reranker: Number of results for reranking
         r: Relevance threshold for initial filtering
         hybrid_bm25_weight: Weight for BM25 in hybrid search
+        embedding_model: Embedding model name; when given, query embeddings
+            are cached per model
+        metadata_filter: Metadata filter (e.g. {"file_id": {"$in": [...]}})
+            applied inside the vector DB to knowledge base searches
 
     Returns:
         UnifiedSearchResult containing all results and metadata
@@ -526,129 +946,140 @@ async def unified_search(
     try:
         logger.info(f"Starting unified search for user {user_id}: {query}")
 
+        # Serve identical repeat queries from the cache. Reranking functions
+        # have no stable identity to key on, so reranked searches bypass it
+        cache_key = None
+        if reranking_function is None:
+            cache_key = UNIFIED_SEARCH_CACHE.make_key(
+                user_id,
+                query,
+                k,
+                hybrid_search,
+                hybrid_bm25_weight,
+                r,
+                embedding_model,
+                (
+                    orjson.dumps(metadata_filter, option=orjson.OPT_SORT_KEYS)
+                    if metadata_filter
+                    else None
+                ),
+            )
+            cached = UNIFIED_SEARCH_CACHE.get(cache_key)
+            if cached is not None:
+                logger.debug(f"Unified search cache hit for user {user_id}")
+                return copy.deepcopy(cached)
+
+        if embedding_model:
+            embedding_function = cached_embedding_function(embedding_function, embedding_model)
+
+        # Start the notes/prompts lookups right away so their database reads
+        # overlap the collection lookup, query embedding and vector search
+        notes_task = asyncio.ensure_future(search_notes(user_id=user_id, query=query, k=k))
+        prompts_task = asyncio.ensure_future(search_prompts(user_id=user_id, query=query, k=k))
+
         # Initialize search results list
         search_results = []
 
-        # Get all user collections for knowledge base search
-        collections_with_names = await get_all_user_collections(user_id)
+        # Find the vector search targets: knowledge base collections and memories
+        collections_with_names, memories = await asyncio.gather(
+            get_all_user_collections(user_id),
+            _run_blocking(_DB_EXECUTOR, Memories.get_memories_by_user_id, user_id),
+            return_exceptions=True,
+        )
+        if isinstance(collections_with_names, Exception):
+            logger.error(f"Error getting user collections: {collections_with_names}")
+            collections_with_names = []
+        if isinstance(memories, Exception):
+            logger.error(f"Error getting user memories: {memories}")
+            memories = []
+
+        # Embed the query once and share it between the vector searches,
+        # skipping it entirely when there is nothing to search against
+        query_embedding = None
+        if collections_with_names or memories:
+            try:
+                query_embedding = await _run_blocking(
+                    _SEARCH_EXECUTOR, embedding_function, query, RAG_EMBEDDING_QUERY_PREFIX
+                )
+            except Exception as e:
+                logger.error(f"Error embedding query: {e}")
 
-        # Search knowledge bases if available
+        # Build the knowledge base search (vector or hybrid)
         if collections_with_names:
             collection_ids = [cid for cid, _ in collections_with_names]
-            collection_names_map = {cid: name for cid, name in collections_with_names}
-
-            # Perform search (vector or hybrid)
-            if hybrid_search:
-                raw_results = await search_collections_hybrid(
-                    collection_names=collection_ids,
-                    query=query,
-                    embedding_function=embedding_function,
-                    k=k,
-                    r=r,
-                    bm25_weight=hybrid_bm25_weight,
-                )
-            else:
-                raw_results = await search_collections(
-                    collection_names=collection_ids,
-                    query=query,
-                    embedding_function=embedding_function,
-                    k=k,
-                    r=r,
-                )
 
-            # Convert raw results to SearchResult objects
-            if raw_results:
-                for item in raw_results:
-                    # Extract data from result format
-                    # Results are tuples: (source_id, distance/score, document_dict)
-                    if isinstance(item, tuple) and len(item) >= 3:
-                        source_id = item[0]
-                        score = float(item[1]) if isinstance(item[1], (int, float)) else 0.0
-                        document = item[2] if len(item) > 2 else {}
-
-                        # Get content and metadata
-                        content = document.get("text", "") or document.get("content", "")
-                        metadata = document.get("metadata", {})
-
-                        # Get collection name
-                        collection_id = metadata.get("collection_name", source_id)
-                        collection_name = collection_names_map.get(collection_id, "Unknown")
-
-                        search_results.append(SearchResult(
-                            content=content,
-                            metadata=metadata,
-                            score=score,
-                            source=collection_id,
-                            source_name=collection_name,
-                        ))
-                    elif isinstance(item, dict):
-                        # Alternative format: dict with score and document
-                        score = float(item.get("score", 0.0))
-                        content = item.get("content", "") or item.get("text", "")
-                        metadata = item.get("metadata", {})
-                        source_id = item.get("source", "")
-
-                        collection_id = metadata.get("collection_name", source_id)
-                        collection_name = collection_names_map.get(collection_id, "Unknown")
-
-                        search_results.append(SearchResult(
-                            content=content,
-                            metadata=metadata,
-                            score=score,
-                            source=collection_id,
-                            source_name=collection_name,
-                        ))
-
-        # Search memories
-        try:
-            memory_results = await search_memories(
-                user_id=user_id,
+            # Filters can only be pushed down on the vector path; the hybrid
+            # BM25 side ranks over whole collections
+            kb_coro = search_collections(
+                collection_names=collection_ids,
                 query=query,
                 embedding_function=embedding_function,
                 k=k,
+                r=r,
+                query_embedding=query_embedding,
+                metadata_filter=metadata_filter,
+                mode="hybrid" if hybrid_search and not metadata_filter else "vector",
+                bm25_weight=hybrid_bm25_weight,
+                reranking_function=reranking_function,
+                k_reranker=k_reranker,
             )
-            search_results.extend(memory_results)
-            logger.debug(f"Added {len(memory_results)} memory results")
-        except Exception as e:
-            logger.error(f"Error searching memories: {e}")
-
-        # Search notes
-        try:
-            note_results = await search_notes(
-                user_id=user_id,
-                query=query,
-                k=k,
-            )
-            search_results.extend(note_results)
-            logger.debug(f"Added {len(note_results)} note results")
-        except Exception as e:
-            logger.error(f"Error searching notes: {e}")
-
-        # Search prompts
-        try:
-            prompt_results = await search_prompts(
+        else:
+            kb_coro = asyncio.sleep(0, result=[])
+
+        if memories:
+            mem_coro = search_memories(
                 user_id=user_id,
                 query=query,
+                embedding_function=embedding_function,
                 k=k,
+                query_embedding=query_embedding,
+                memories=memories,
             )
-            search_results.extend(prompt_results)
-            logger.debug(f"Added {len(prompt_results)} prompt results")
-        except Exception as e:
-            logger.error(f"Error searching prompts: {e}")
+        else:
+            mem_coro = asyncio.sleep(0, result=[])
+
+        # The sources hit independent backends, so run them concurrently
+        raw_results, memory_results, note_results, prompt_results = await asyncio.gather(
+            kb_coro, mem_coro, notes_task, prompts_task, return_exceptions=True
+        )
+
+        if isinstance(raw_results, Exception):
+            logger.error(f"Error searching knowledge bases: {raw_results}")
+            raw_results = []
+
+        # Convert raw results to SearchResult objects
+        if raw_results:
+            # Only map names for the collections that actually returned hits
+            touched = {item[0] for item in raw_results}
+            collection_names_map = {
+                cid: name for cid, name in collections_with_names if cid in touched
+            }
+            search_results.extend(_convert_raw_results(raw_results, collection_names_map))
+
+        for label, results in (
+            ("memory", memory_results),
+            ("note", note_results),
+            ("prompt", prompt_results),
+        ):
+            if isinstance(results, Exception):
+                logger.error(f"Error searching {label}s: {results}")
+                continue
+            search_results.extend(results)
+            logger.debug(f"Added {len(results)} {label} results")
 
         # If no results from any source, return empty result
         if not search_results:
             logger.info("No results found from any source")
-            return UnifiedSearchResult(query=query)
-
-        # Sort by score (descending)
-        search_results.sort(key=lambda x: x.score, reverse=True)
+            result = UnifiedSearchResult(query=query)
+            if cache_key is not None:
+                UNIFIED_SEARCH_CACHE.put(cache_key, copy.deepcopy(result))
+            return result
 
-        # Limit to k results (no threshold filtering - let middleware decide)
-        final_results = search_results[:k]
+        # Take the k best results by score (no threshold filtering - let middleware decide)
+        final_results = _top_k(_dedupe_results(search_results), k)
 
-        # Log result details
-        max_score = max(r.score for r in final_results) if final_results else 0.0
+        # Results are sorted best first, so the aggregates come for free
+        max_score = final_results[0].score if final_results else 0.0
         logger.info(
             f"Unified search complete: {len(final_results)} results "
             f"(max_score={max_score:.3f}, threshold={threshold})"
@@ -656,9 +1087,14 @@ async def unified_search(
 
         result = UnifiedSearchResult(
             results=final_results,
+            total_count=len(final_results),
+            max_score=max_score,
+            sources=list(dict.fromkeys(r.source for r in final_results)),
             query=query,
         )
 
+        if cache_key is not None:
+            UNIFIED_SEARCH_CACHE.put(cache_key, copy.deepcopy(result))
         return result
 
     except Exception as e:
@@ -683,23 +1119,38 @@ async def get_search_context(
     if not unified_result.results:
         return ""
 
-    context_parts = []
+    buf = io.StringIO()
     current_length = 0
+    included = 0
+    sep = "\n\n"
 
-    for i, result in enumerate(unified_result.results, 1):
+    for result in unified_result.results:
         # Format: [Source: Name] Content
         source_prefix = f"[Source: {result.source_name}] "
-        result_text = f"{source_prefix}{result.content}\n\n"
+        piece_len = len(source_prefix) + len(result.content) + len(sep)
 
         # Check if adding this would exceed limit
-        if current_length + len(result_text) > max_context_length:
+        if current_length + piece_len > max_context_length:
+            # Fill the leftover room with the start of this result, cut at a
+            # sentence or line boundary, if enough room is left to be useful
+            remaining = max_context_length - current_length - len(source_prefix) - len(sep)
+            if remaining > MIN_TRUNCATED_CONTENT_LENGTH:
+                content = result.content
+                end = max(content.rfind(". ", 0, remaining) + 1, content.rfind("\n", 0, remaining))
+                buf.write(source_prefix)
+                buf.write(content[:end] if end > 0 else content[:remaining])
+                buf.write(sep)
+                included += 1
             break
 
-        context_parts.append(result_text)
-        current_length += len(result_text)
+        buf.write(source_prefix)
+        buf.write(result.content)
+        buf.write(sep)
+        current_length += piece_len
+        included += 1
 
-    context = "".join(context_parts).strip()
+    context = buf.getvalue().strip()
 
-    logger.debug(f"Generated context of {len(context)} characters from {len(context_parts)} results")
+    logger.debug(f"Generated context of {len(context)} characters from {included} results")
 
     return context
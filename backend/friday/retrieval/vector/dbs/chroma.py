@@ -71,22 +71,29 @@ class ChromaClient(VectorDBBase):
         return self.client.delete_collection(name=collection_name)
 
     def search(
-        self, collection_name: str, vectors: list[list[float | int]], limit: int
+        self,
+        collection_name: str,
+        vectors: list[list[float | int]],
+        limit: int,
+        filter: Optional[dict] = None,
     ) -> Optional[SearchResult]:
         # Search for the nearest neighbor items based on the vectors and return 'limit' number of results.
+        # A metadata filter is pushed down as a where clause so Chroma prunes before ranking.
         try:
             collection = self.client.get_collection(name=collection_name)
             if collection:
                 result = collection.query(
                     query_embeddings=vectors,
                     n_results=limit,
+                    where=filter or None,
                 )
 
                 # chromadb has cosine distance, 2 (worst) -> 0 (best). Re-odering to 0 -> 1
                 # https://docs.trychroma.com/docs/collections/configure cosine equation
-                distances: list = result["distances"][0]
-                distances = [2 - dist for dist in distances]
-                distances = [[dist / 2 for dist in distances]]
+                # Normalize every query's row, not just the first, so multi-vector searches line up
+                distances = [
+                    [(2 - dist) / 2 for dist in row] for row in result["distances"]
+                ]
 
                 return SearchResult(
                     **{
@@ -1,3 +1,7 @@
+from functools import lru_cache
+from importlib import import_module
+from typing import Callable
+
 from friday.retrieval.vector.main import VectorDBBase
 from friday.retrieval.vector.type import VectorType
 from friday.config import (
@@ -7,68 +11,42 @@ from friday.config import (
 )
 
 
+def _load(module: str, class_name: str) -> VectorDBBase:
+    """Import a vector db backend module on first use and instantiate its client"""
+    return getattr(import_module(f"friday.retrieval.vector.dbs.{module}"), class_name)()
+
+
+_LOADERS: dict[str, Callable[[], VectorDBBase]] = {
+    VectorType.MILVUS: lambda: _load(
+        "milvus_multitenancy" if ENABLE_MILVUS_MULTITENANCY_MODE else "milvus",
+        "MilvusClient",
+    ),
+    VectorType.QDRANT: lambda: _load(
+        "qdrant_multitenancy" if ENABLE_QDRANT_MULTITENANCY_MODE else "qdrant",
+        "QdrantClient",
+    ),
+    VectorType.PINECONE: lambda: _load("pinecone", "PineconeClient"),
+    VectorType.S3VECTOR: lambda: _load("s3vector", "S3VectorClient"),
+    VectorType.OPENSEARCH: lambda: _load("opensearch", "OpenSearchClient"),
+    VectorType.PGVECTOR: lambda: _load("pgvector", "PgvectorClient"),
+    VectorType.ELASTICSEARCH: lambda: _load("elasticsearch", "ElasticsearchClient"),
+    VectorType.CHROMA: lambda: _load("chroma", "ChromaClient"),
+    VectorType.ORACLE23AI: lambda: _load("oracle23ai", "Oracle23aiClient"),
+}
+
+
 class Vector:
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def get_vector(vector_type: str) -> VectorDBBase:
         """
         get vector db instance by vector type
         """
-        match vector_type:
-            case VectorType.MILVUS:
-                if ENABLE_MILVUS_MULTITENANCY_MODE:
-                    from friday.retrieval.vector.dbs.milvus_multitenancy import (
-                        MilvusClient,
-                    )
-
-                    return MilvusClient()
-                else:
-                    from friday.retrieval.vector.dbs.milvus import MilvusClient
-
-                    return MilvusClient()
-            case VectorType.QDRANT:
-                if ENABLE_QDRANT_MULTITENANCY_MODE:
-                    from friday.retrieval.vector.dbs.qdrant_multitenancy import (
-                        QdrantClient,
-                    )
-
-                    return QdrantClient()
-                else:
-                    from friday.retrieval.vector.dbs.qdrant import QdrantClient
-
-                    return QdrantClient()
-            case VectorType.PINECONE:
-                from friday.retrieval.vector.dbs.pinecone import PineconeClient
-
-                return PineconeClient()
-            case VectorType.S3VECTOR:
-                from friday.retrieval.vector.dbs.s3vector import S3VectorClient
-
-                return S3VectorClient()
-            case VectorType.OPENSEARCH:
-                from friday.retrieval.vector.dbs.opensearch import OpenSearchClient
-
-                return OpenSearchClient()
-            case VectorType.PGVECTOR:
-                from friday.retrieval.vector.dbs.pgvector import PgvectorClient
-
-                return PgvectorClient()
-            case VectorType.ELASTICSEARCH:
-                from friday.retrieval.vector.dbs.elasticsearch import (
-                    ElasticsearchClient,
-                )
-
-                return ElasticsearchClient()
-            case VectorType.CHROMA:
-                from friday.retrieval.vector.dbs.chroma import ChromaClient
-
-                return ChromaClient()
-            case VectorType.ORACLE23AI:
-                from friday.retrieval.vector.dbs.oracle23ai import Oracle23aiClient
-
-                return Oracle23aiClient()
-            case _:
-                raise ValueError(f"Unsupported vector type: {vector_type}")
+        loader = _LOADERS.get(vector_type)
+        if loader is None:
+            raise ValueError(f"Unsupported vector type: {vector_type}")
+        return loader()
 
 
 VECTOR_DB_CLIENT = Vector.get_vector(VECTOR_DB)
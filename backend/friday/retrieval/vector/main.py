@@ -1,6 +1,6 @@
 from pydantic import BaseModel
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Protocol, Union
 
 
 class VectorItem(BaseModel):
@@ -20,6 +20,15 @@ class SearchResult(GetResult):
     distances: Optional[List[List[float | int]]]
 
 
+class VectorSearchResult(Protocol):
+    """Shape every backend's search result is read through (per-query rows)"""
+
+    ids: List[List[str]]
+    documents: List[List[str]]
+    metadatas: List[List[Any]]
+    distances: List[List[float | int]]
+
+
 class VectorDBBase(ABC):
     """
     Abstract base class for all vector database backends.
@@ -53,11 +62,31 @@ class VectorDBBase(ABC):
 
     @abstractmethod
     def search(
-        self, collection_name: str, vectors: List[List[Union[float, int]]], limit: int
+        self,
+        collection_name: str,
+        vectors: List[List[Union[float, int]]],
+        limit: int,
+        filter: Optional[Dict] = None,
     ) -> Optional[SearchResult]:
-        """Search for similar vectors in a collection."""
+        """Search for similar vectors in a collection, optionally restricted by a metadata filter."""
         pass
 
+    def batch_search(
+        self,
+        collection_names: List[str],
+        vectors: List[List[Union[float, int]]],
+        limit: int,
+        filter: Optional[Dict] = None,
+    ) -> List[Optional[SearchResult]]:
+        """
+        Search several collections with the same query vectors in one request.
+
+        Optional hook for backends that support multi-collection queries;
+        returns one result per collection, in the order of collection_names.
+        Callers fall back to per-collection search when it isn't overridden.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     def query(
         self, collection_name: str, filter: Dict, limit: Optional[int] = None
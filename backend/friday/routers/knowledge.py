@@ -11,6 +11,7 @@ from friday.models.knowledge import (
 )
 from friday.models.files import Files, FileModel, FileMetadataResponse
 from friday.retrieval.vector.factory import VECTOR_DB_CLIENT
+from friday.retrieval.query_cache import UNIFIED_SEARCH_CACHE
 from friday.routers.retrieval import (
     process_file,
     ProcessFileForm,
@@ -477,6 +478,7 @@ def update_file_from_knowledge_by_id(
     VECTOR_DB_CLIENT.delete(
         collection_name=knowledge.id, filter={"file_id": form_data.file_id}
     )
+    UNIFIED_SEARCH_CACHE.bump_version()
 
     # Add content to the vector database
     try:
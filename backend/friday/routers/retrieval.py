@@ -38,6 +38,7 @@ from friday.storage.provider import Storage
 
 
 from friday.retrieval.vector.factory import VECTOR_DB_CLIENT
+from friday.retrieval.query_cache import UNIFIED_SEARCH_CACHE
 
 # Document loaders
 from friday.retrieval.loaders.main import Loader
@@ -1477,6 +1478,9 @@ def save_docs_to_vector_db(
         )
 
         log.info(f"added {len(items)} items to collection {collection_name}")
+
+        # Knowledge content changed, so cached search results may be stale
+        UNIFIED_SEARCH_CACHE.bump_version()
         return True
     except Exception as e:
         log.exception(e)
@@ -2374,6 +2378,7 @@ def delete_entries_from_collection(form_data: DeleteForm, user=Depends(get_admin
                 collection_name=form_data.collection_name,
                 metadata={"hash": hash},
             )
+            UNIFIED_SEARCH_CACHE.bump_version()
             return {"status": True}
         else:
             return {"status": False}
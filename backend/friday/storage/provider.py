@@ -15,6 +15,9 @@ from friday.env import SRC_LOG_LEVELS
 log = logging.getLogger(__name__)
 log.setLevel(SRC_LOG_LEVELS["MAIN"])
 
+# Buffer size used when streaming uploads to disk
+UPLOAD_CHUNK_SIZE = 1024 * 1024
+
 
 class StorageProvider(ABC):
     @abstractmethod
@@ -24,7 +27,8 @@ class StorageProvider(ABC):
     @abstractmethod
     def upload_file(
         self, file: BinaryIO, filename: str, tags: Dict[str, str]
-    ) -> Tuple[bytes, str]:
+    ) -> Tuple[int, str]:
+        """Store the file and return (size in bytes, file path)"""
         pass
 
     @abstractmethod
@@ -40,14 +44,19 @@ class LocalStorageProvider(StorageProvider):
     @staticmethod
     def upload_file(
         file: BinaryIO, filename: str, tags: Dict[str, str]
-    ) -> Tuple[bytes, str]:
-        contents = file.read()
-        if not contents:
+    ) -> Tuple[int, str]:
+        # Stream in bounded chunks so large uploads never sit in memory whole
+        first = file.read(UPLOAD_CHUNK_SIZE)
+        if not first:
             raise ValueError(ERROR_MESSAGES.EMPTY_CONTENT)
         file_path = f"{UPLOAD_DIR}/{filename}"
         with open(file_path, "wb") as f:
-            f.write(contents)
-        return contents, file_path
+            if hasattr(os, "posix_fadvise"):
+                os.posix_fadvise(f.fileno(), 0, 0, os.POSIX_FADV_SEQUENTIAL)
+            f.write(first)
+            shutil.copyfileobj(file, f, UPLOAD_CHUNK_SIZE)
+            size = f.tell()
+        return size, file_path
 
     @staticmethod
     def get_file(file_path: str) -> str:
@@ -68,15 +77,17 @@ class LocalStorageProvider(StorageProvider):
     def delete_all_files() -> None:
         """Handles deletion of all files from local storage."""
         if os.path.exists(UPLOAD_DIR):
-            for filename in os.listdir(UPLOAD_DIR):
-                file_path = os.path.join(UPLOAD_DIR, filename)
-                try:
-                    if os.path.isfile(file_path) or os.path.islink(file_path):
-                        os.unlink(file_path)  # Remove the file or link
-                    elif os.path.isdir(file_path):
-                        shutil.rmtree(file_path)  # Remove the directory
-                except Exception as e:
-                    log.exception(f"Failed to delete {file_path}. Reason: {e}")
+            # scandir reports entry types from the directory listing itself,
+            # so no extra stat() call is needed per entry
+            with os.scandir(UPLOAD_DIR) as entries:
+                for entry in entries:
+                    try:
+                        if entry.is_file(follow_symlinks=False) or entry.is_symlink():
+                            os.unlink(entry.path)  # Remove the file or link
+                        elif entry.is_dir(follow_symlinks=False):
+                            shutil.rmtree(entry.path)  # Remove the directory
+                    except Exception as e:
+                        log.exception(f"Failed to delete {entry.path}. Reason: {e}")
         else:
             log.warning(f"Directory {UPLOAD_DIR} not found in local storage.")
 
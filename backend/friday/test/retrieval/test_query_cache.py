@@ -0,0 +1,109 @@
+from unittest.mock import patch
+
+from friday.retrieval.query_cache import QueryCache
+
+
+class TestQueryCache:
+    """Test the versioned LRU query cache"""
+
+    def test_put_and_get(self):
+        """Test a stored value is returned under the same key"""
+        cache = QueryCache()
+        key = cache.make_key("user-1", "query", 5)
+        cache.put(key, "result")
+
+        assert cache.get(key) == "result"
+
+    def test_keys_depend_on_parts(self):
+        """Test different users and parameters give different keys"""
+        cache = QueryCache()
+
+        assert cache.make_key("user-1", "query", 5) == cache.make_key(
+            "user-1", "query", 5
+        )
+        assert cache.make_key("user-1", "query", 5) != cache.make_key(
+            "user-1", "query", 6
+        )
+        assert cache.make_key("user-1", "query", 5) != cache.make_key(
+            "user-2", "query", 5
+        )
+
+    def test_user_bump_invalidates_only_that_user(self):
+        """Test bumping a user's version changes only their keys"""
+        cache = QueryCache()
+        key_1 = cache.make_key("user-1", "query")
+        key_2 = cache.make_key("user-2", "query")
+        cache.put(key_1, "a")
+        cache.put(key_2, "b")
+
+        cache.bump_version("user-1")
+
+        assert cache.get(cache.make_key("user-1", "query")) is None
+        assert cache.get(cache.make_key("user-2", "query")) == "b"
+
+    def test_global_bump_invalidates_everyone(self):
+        """Test bumping the global version changes every key"""
+        cache = QueryCache()
+        cache.put(cache.make_key("user-1", "query"), "a")
+        cache.put(cache.make_key("user-2", "query"), "b")
+
+        cache.bump_version()
+
+        assert cache.get(cache.make_key("user-1", "query")) is None
+        assert cache.get(cache.make_key("user-2", "query")) is None
+
+    def test_bump_versions(self):
+        """Test bumping a set of users, or everyone for None"""
+        cache = QueryCache()
+        cache.put(cache.make_key("user-1", "query"), "a")
+        cache.put(cache.make_key("user-2", "query"), "b")
+        cache.put(cache.make_key("user-3", "query"), "c")
+
+        cache.bump_versions(["user-1", "user-2"])
+
+        assert cache.get(cache.make_key("user-1", "query")) is None
+        assert cache.get(cache.make_key("user-2", "query")) is None
+        assert cache.get(cache.make_key("user-3", "query")) == "c"
+
+        cache.bump_versions(None)
+
+        assert cache.get(cache.make_key("user-3", "query")) is None
+
+    def test_expiry(self):
+        """Test entries expire after the TTL"""
+        cache = QueryCache(ttl=10)
+        key = cache.make_key("user-1", "query")
+        with patch("friday.retrieval.query_cache.time.monotonic", return_value=100.0):
+            cache.put(key, "result")
+        with patch("friday.retrieval.query_cache.time.monotonic", return_value=109.0):
+            assert cache.get(key) == "result"
+        with patch("friday.retrieval.query_cache.time.monotonic", return_value=110.0):
+            assert cache.get(key) is None
+
+    def test_lru_eviction(self):
+        """Test the least recently used entry is evicted first"""
+        cache = QueryCache(max_size=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.get("c") == 3
+
+    def test_stats(self):
+        """Test hits, misses and evictions are counted"""
+        cache = QueryCache(max_size=1)
+        cache.put("a", 1)
+        cache.get("a")
+        cache.get("missing")
+        cache.put("b", 2)
+
+        stats = cache.get_stats()
+
+        assert stats["size"] == 1
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["evictions"] == 1
+        assert stats["hit_rate"] == 0.5
@@ -0,0 +1,208 @@
+import pytest
+from unittest.mock import patch
+
+from friday.retrieval.text_index import (
+    BM25Index,
+    TextIndexCache,
+    VECTORIZE_MIN_DOCS,
+    tokenize,
+    tokenize_query,
+)
+
+
+class TestBM25Index:
+    """Test BM25 ranking over the inverted index"""
+
+    def test_tokenize(self):
+        """Test tokens are lowercased words"""
+        assert tokenize("Hello, World! foo_bar 42") == [
+            "hello",
+            "world",
+            "foo_bar",
+            "42",
+        ]
+        assert tokenize("") == []
+
+    def test_tokenize_query_dedupes_in_order(self):
+        """Test query tokens are distinct and keep their order"""
+        assert tokenize_query("Python python JAVA python") == ("python", "java")
+
+    def test_query_ranks_matching_documents(self):
+        """Test documents with more query terms rank first"""
+        index = BM25Index.build(
+            [
+                ("a", "python programming language"),
+                ("b", "python snake"),
+                ("c", "cooking recipes"),
+            ]
+        )
+
+        results = index.query(tokenize("python programming"), k=10)
+
+        assert [doc_id for doc_id, _ in results] == ["a", "b"]
+        assert all(0.0 < score <= 1.0 for _, score in results)
+
+    def test_exact_match_scores_one(self):
+        """Test the best document matching every query term scores 1.0"""
+        index = BM25Index.build(
+            [
+                ("a", "quarterly budget review meeting notes"),
+                ("b", "budget"),
+                ("c", "grocery list"),
+            ]
+        )
+
+        results = dict(index.query(tokenize("quarterly budget review"), k=10))
+
+        assert results["a"] == pytest.approx(1.0)
+        assert results["b"] < 0.5
+
+    def test_partial_match_scores_below_one(self):
+        """Test a best document missing query terms does not score 1.0"""
+        index = BM25Index.build([("a", "budget"), ("b", "grocery list")])
+
+        [(doc_id, score)] = index.query(tokenize("quarterly budget review"), k=10)
+
+        assert doc_id == "a"
+        assert score < 1.0
+
+    def test_query_limits_results(self):
+        """Test only the k best documents are returned"""
+        index = BM25Index.build([(str(i), "shared term") for i in range(10)])
+
+        assert len(index.query(["shared"], k=3)) == 3
+
+    def test_query_without_matches(self):
+        """Test unknown terms return no results"""
+        index = BM25Index.build([("a", "python")])
+
+        assert index.query(["rust"], k=5) == []
+
+    def test_empty_documents_are_skipped(self):
+        """Test empty documents are left out of the corpus statistics"""
+        index = BM25Index.build([("a", "python"), ("b", ""), ("c", "   ")])
+
+        assert list(index.doc_len) == ["a"]
+        assert index.avgdl == 1.0
+
+    def test_empty_index(self):
+        """Test querying an index without documents"""
+        index = BM25Index.build([])
+
+        assert index.query(["python"], k=5) == []
+
+    def test_large_corpus_uses_arrays(self):
+        """Test corpora above the threshold are scored with NumPy arrays"""
+        docs = [
+            (f"doc-{i}", f"common word{i % 7} " * (1 + i % 5))
+            for i in range(VECTORIZE_MIN_DOCS + 1)
+        ]
+        index = BM25Index.build(docs)
+
+        assert index.array_postings
+        assert len(index.doc_ids) == len(docs)
+
+    def test_small_corpus_skips_arrays(self):
+        """Test corpora at or below the threshold keep dict postings only"""
+        docs = [(f"doc-{i}", "common") for i in range(VECTORIZE_MIN_DOCS)]
+        index = BM25Index.build(docs)
+
+        assert not index.array_postings
+
+    def test_array_scores_match_dict_scores(self):
+        """Test the vectorized path ranks like the scalar path"""
+        docs = [
+            (f"doc-{i}", f"alpha {'beta ' * (i % 4)}gamma{i % 9} filler{i}")
+            for i in range(VECTORIZE_MIN_DOCS + 50)
+        ]
+        tokens = tokenize("alpha beta gamma3")
+
+        index = BM25Index.build(docs)
+        assert index.array_postings
+        vectorized = dict(index.query(tokens, k=len(docs)))
+
+        index.array_postings = {}
+        scalar = dict(index.query(tokens, k=len(docs)))
+
+        assert vectorized.keys() == scalar.keys()
+        for doc_id, score in scalar.items():
+            assert vectorized[doc_id] == pytest.approx(score, rel=1e-5)
+
+    def test_array_query_limits_results(self):
+        """Test the vectorized path returns the k best, best first"""
+        docs = [
+            (f"doc-{i}", "term " * (1 + i % 10)) for i in range(VECTORIZE_MIN_DOCS + 1)
+        ]
+        index = BM25Index.build(docs)
+
+        results = index.query(["term"], k=5)
+
+        assert len(results) == 5
+        scores = [score for _, score in results]
+        assert scores == sorted(scores, reverse=True)
+        assert index.query(["term"], k=0) == []
+
+
+class TestTextIndexCache:
+    """Test the per-user index cache"""
+
+    def test_put_and_get(self):
+        """Test a stored value is returned for its user only"""
+        cache = TextIndexCache()
+        cache.put("user-1", "index", cache.get_version("user-1"))
+
+        assert cache.get("user-1") == "index"
+        assert cache.get("user-2") is None
+
+    def test_global_invalidate(self):
+        """Test invalidating without users drops every entry"""
+        cache = TextIndexCache()
+        cache.put("user-1", "a", cache.get_version("user-1"))
+        cache.put("user-2", "b", cache.get_version("user-2"))
+
+        cache.invalidate()
+
+        assert cache.get("user-1") is None
+        assert cache.get("user-2") is None
+
+    def test_per_user_invalidate(self):
+        """Test invalidating users keeps everyone else's entries"""
+        cache = TextIndexCache()
+        cache.put("user-1", "a", cache.get_version("user-1"))
+        cache.put("user-2", "b", cache.get_version("user-2"))
+
+        cache.invalidate(["user-1"])
+
+        assert cache.get("user-1") is None
+        assert cache.get("user-2") == "b"
+
+    def test_stale_build_is_discarded(self):
+        """Test a value built before an invalidation is never served"""
+        cache = TextIndexCache()
+        version = cache.get_version("user-1")
+
+        # The user's data changes while the index is being built
+        cache.invalidate(["user-1"])
+        cache.put("user-1", "stale", version)
+
+        assert cache.get("user-1") is None
+
+    def test_stale_build_after_global_invalidate(self):
+        """Test a global invalidation also discards in-flight builds"""
+        cache = TextIndexCache()
+        version = cache.get_version("user-1")
+
+        cache.invalidate()
+        cache.put("user-1", "stale", version)
+
+        assert cache.get("user-1") is None
+
+    def test_expiry(self):
+        """Test entries expire after the TTL"""
+        cache = TextIndexCache(ttl=10)
+        with patch("friday.retrieval.text_index.time.monotonic", return_value=100.0):
+            cache.put("user-1", "index", cache.get_version("user-1"))
+        with patch("friday.retrieval.text_index.time.monotonic", return_value=105.0):
+            assert cache.get("user-1") == "index"
+        with patch("friday.retrieval.text_index.time.monotonic", return_value=111.0):
+            assert cache.get("user-1") is None
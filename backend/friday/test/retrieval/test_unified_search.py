@@ -0,0 +1,292 @@
+import pytest
+from types import SimpleNamespace
+
+from friday.retrieval import unified_search
+from friday.retrieval.unified_search import (
+    RRF_K,
+    SearchResult,
+    UnifiedSearchResult,
+    _dedupe_results,
+    _top_k,
+    get_search_context,
+    search_collections,
+    search_notes,
+)
+from friday.retrieval.text_index import NOTES_INDEX_CACHE
+
+
+def make_vector_result(documents, distances):
+    """Build a single-query vector DB search result"""
+    return SimpleNamespace(
+        ids=[[f"id-{i}" for i in range(len(documents))]],
+        documents=[documents],
+        metadatas=[[{"name": document} for document in documents]],
+        distances=[distances],
+    )
+
+
+def make_search_result(content, source_name="Source", score=1.0):
+    return SearchResult(
+        content=content,
+        metadata={},
+        score=score,
+        source=source_name,
+        source_name=source_name,
+    )
+
+
+class TestSearchNotes:
+    """Test ranking notes against the other search sources"""
+
+    @pytest.fixture
+    def notes_index(self):
+        def make_note(note_id, title, text):
+            return SimpleNamespace(
+                id=note_id,
+                title=title,
+                data={"content": {"md": text}},
+                created_at=0,
+            )
+
+        notes = [
+            make_note("n-1", "Quarterly budget review", "Numbers for the review."),
+            make_note("n-2", "Groceries", "Milk, eggs and the weekly budget."),
+            make_note("n-3", "Trip", "Pack the tent."),
+        ]
+        index = unified_search._build_notes_index(notes)
+        NOTES_INDEX_CACHE.put("user-1", index, NOTES_INDEX_CACHE.get_version("user-1"))
+        yield
+        NOTES_INDEX_CACHE.invalidate(["user-1"])
+
+    @pytest.mark.asyncio
+    async def test_exact_note_match_outranks_weak_kb_hit(self, notes_index):
+        """Test a note matching the whole query beats a weak vector hit"""
+        notes = await search_notes("user-1", "quarterly budget review", k=3)
+        weak_kb_hit = make_search_result("Unrelated chunk", "KB", score=0.7)
+
+        ranked = _top_k(notes + [weak_kb_hit], 2)
+
+        assert ranked[0].source == "n-1"
+        assert ranked[0].score == pytest.approx(1.0)
+        # A note only sharing a common word stays below the weak hit
+        partial = next(result for result in notes if result.source == "n-2")
+        assert partial.score < weak_kb_hit.score
+
+
+class TestDedupeResults:
+    """Test collapsing duplicate results"""
+
+    def test_keeps_best_scoring_copy(self):
+        """Test identical content is kept once, with its best score"""
+        results = [
+            make_search_result("same", "One", score=0.4),
+            make_search_result("other", "One", score=0.5),
+            make_search_result("same", "Two", score=0.9),
+        ]
+
+        deduped = _dedupe_results(results)
+
+        assert len(deduped) == 2
+        best = next(result for result in deduped if result.content == "same")
+        assert (best.source_name, best.score) == ("Two", 0.9)
+
+    def test_distinct_content_is_kept(self):
+        """Test results with different content are all kept"""
+        results = [make_search_result("a"), make_search_result("b")]
+
+        assert _dedupe_results(results) == results
+
+
+class TestTopK:
+    """Test selecting the best results"""
+
+    def test_returns_best_first(self):
+        """Test the k highest scores are returned in descending order"""
+        scores = [0.3, 0.9, 0.1, 0.7, 0.5, 0.8]
+        results = [make_search_result(str(i), score=s) for i, s in enumerate(scores)]
+
+        top = _top_k(results, 3)
+
+        assert [result.score for result in top] == pytest.approx([0.9, 0.8, 0.7])
+
+    def test_fewer_results_than_k(self):
+        """Test all results are sorted when there are at most k"""
+        results = [
+            make_search_result("a", score=0.2),
+            make_search_result("b", score=0.6),
+        ]
+
+        assert [result.content for result in _top_k(results, 5)] == ["b", "a"]
+
+    def test_non_positive_k(self):
+        """Test k <= 0 selects nothing"""
+        assert _top_k([make_search_result("a")], 0) == []
+
+
+class TestSearchCollections:
+    """Test Reciprocal Rank Fusion across collections"""
+
+    @pytest.fixture
+    def batch_results(self, monkeypatch):
+        results = {}
+
+        async def fake_batch_search(
+            collection_names, vectors, limit, metadata_filter=None
+        ):
+            return [results.get(name) for name in collection_names]
+
+        monkeypatch.setattr(unified_search, "_batch_search", fake_batch_search)
+        return results
+
+    @pytest.mark.asyncio
+    async def test_documents_in_several_collections_rank_first(self, batch_results):
+        """Test a document ranked in two collections beats single-collection hits"""
+        batch_results["kb-1"] = make_vector_result(["only-1", "shared"], [0.95, 0.9])
+        batch_results["kb-2"] = make_vector_result(["only-2", "shared"], [0.97, 0.8])
+
+        results = await search_collections(
+            ["kb-1", "kb-2"],
+            "query",
+            embedding_function=None,
+            k=3,
+            query_embedding=[0.1],
+        )
+
+        assert [result[2]["text"] for result in results] == [
+            "shared",
+            "only-2",
+            "only-1",
+        ]
+
+        collection_name, score, document = results[0]
+        assert document["metadata"]["rrf_score"] == pytest.approx(2 / (RRF_K + 2))
+        # The best raw similarity (and its collection) is kept as the score
+        assert (collection_name, score) == ("kb-1", 0.9)
+
+    @pytest.mark.asyncio
+    async def test_relevance_threshold(self, batch_results):
+        """Test hits below r are dropped before ranking"""
+        batch_results["kb-1"] = make_vector_result(["good", "weak"], [0.9, 0.2])
+
+        results = await search_collections(
+            ["kb-1"],
+            "query",
+            embedding_function=None,
+            k=5,
+            r=0.5,
+            query_embedding=[0.1],
+        )
+
+        assert [result[2]["text"] for result in results] == ["good"]
+
+    @pytest.mark.asyncio
+    async def test_limits_and_skips_empty_collections(self, batch_results):
+        """Test at most k results are returned and missing results are ignored"""
+        batch_results["kb-1"] = make_vector_result(["a", "b", "c"], [0.9, 0.8, 0.7])
+
+        results = await search_collections(
+            ["kb-1", "kb-missing"],
+            "query",
+            embedding_function=None,
+            k=2,
+            query_embedding=[0.1],
+        )
+
+        assert [result[2]["text"] for result in results] == ["a", "b"]
+
+    @pytest.mark.asyncio
+    async def test_hybrid_failures_fall_back_to_vector(
+        self, batch_results, monkeypatch
+    ):
+        """Test collections whose hybrid search failed are searched by vector"""
+        batch_results["kb-2"] = make_vector_result(["from-vector"], [0.8])
+
+        async def fake_batch_hybrid_search(collection_names, **kwargs):
+            # kb-1 succeeds, kb-2 fails
+            return [
+                {
+                    "documents": [["from-hybrid"]],
+                    "metadatas": [[{}]],
+                    "distances": [[0.9]],
+                },
+                None,
+            ]
+
+        monkeypatch.setattr(
+            unified_search, "_batch_hybrid_search", fake_batch_hybrid_search
+        )
+
+        results = await search_collections(
+            ["kb-1", "kb-2"],
+            "query",
+            embedding_function=None,
+            k=5,
+            query_embedding=[0.1],
+            mode="hybrid",
+        )
+
+        assert [(result[0], result[2]["text"]) for result in results] == [
+            ("kb-1", "from-hybrid"),
+            ("kb-2", "from-vector"),
+        ]
+
+    @pytest.mark.asyncio
+    async def test_no_collections(self, batch_results):
+        """Test searching no collections returns nothing"""
+        assert await search_collections([], "query", embedding_function=None) == []
+
+
+class TestGetSearchContext:
+    """Test building the LLM context from search results"""
+
+    @pytest.mark.asyncio
+    async def test_empty_results(self):
+        """Test no results give an empty context"""
+        assert await get_search_context(UnifiedSearchResult()) == ""
+
+    @pytest.mark.asyncio
+    async def test_includes_sources(self):
+        """Test results that fit are included whole with their source"""
+        result = UnifiedSearchResult(
+            results=[
+                make_search_result("First.", "One"),
+                make_search_result("Second.", "Two"),
+            ]
+        )
+
+        context = await get_search_context(result)
+
+        assert context == "[Source: One] First.\n\n[Source: Two] Second."
+
+    @pytest.mark.asyncio
+    async def test_truncates_last_result_at_sentence_boundary(self):
+        """Test the result that overflows is cut at the end of a sentence"""
+        long_content = "".join(f"Sentence number {i}. " for i in range(100))
+        result = UnifiedSearchResult(
+            results=[
+                make_search_result("a" * 100, "One"),
+                make_search_result(long_content, "Two"),
+            ]
+        )
+
+        context = await get_search_context(result, max_context_length=500)
+
+        assert len(context) <= 500
+        assert "[Source: Two] Sentence number 0." in context
+        assert context.endswith(".")
+        assert long_content.startswith(context.split("[Source: Two] ")[1])
+
+    @pytest.mark.asyncio
+    async def test_drops_overflowing_result_without_enough_room(self):
+        """Test the overflowing result is skipped when too little room is left"""
+        long_content = "".join(f"Sentence number {i}. " for i in range(100))
+        result = UnifiedSearchResult(
+            results=[
+                make_search_result("a" * 100, "One"),
+                make_search_result(long_content, "Two"),
+            ]
+        )
+
+        context = await get_search_context(result, max_context_length=300)
+
+        assert context == "[Source: One] " + "a" * 100
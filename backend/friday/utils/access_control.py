@@ -6,6 +6,8 @@ from friday.models.groups import Groups
 from friday.config import DEFAULT_USER_PERMISSIONS
 import json
 
+from sqlalchemy import Text, cast, or_
+
 
 def fill_missing_permissions(
     permissions: Dict[str, Any], default_permissions: Dict[str, Any]
@@ -131,6 +133,55 @@ def has_access(
     )
 
 
+def get_access_control_filter(
+    owner_column,
+    access_control_column,
+    user_id: str,
+    type: str = "read",
+    user_group_ids: Optional[Set[str]] = None,
+):
+    """
+    Build a SQL condition matching every row the user could have access to.
+
+    Keeps rows the user owns, public rows (for read) and rows whose access
+    control mentions the user or one of their groups. The last check is a
+    substring match on the serialized JSON, so it can over-match; rows it
+    returns must still be checked with has_access.
+    """
+    access_control_text = cast(access_control_column, Text)
+
+    conditions = [owner_column == user_id]
+    if type == "read":
+        # None is stored as SQL NULL or as JSON null depending on the column
+        conditions += [access_control_column.is_(None), access_control_text == "null"]
+    conditions += [
+        access_control_text.contains(principal_id, autoescape=True)
+        for principal_id in (user_id, *(user_group_ids or ()))
+    ]
+    return or_(*conditions)
+
+
+def get_user_ids_with_access(
+    owner_id: str, type: str = "read", *access_controls: Optional[dict]
+) -> Optional[Set[str]]:
+    """
+    Get the IDs of the owner and every user granted access to a resource
+    under any of the given access controls (e.g. before and after an update).
+
+    Returns None if any of them is public, since every user has access then.
+    """
+    user_ids = {owner_id}
+    for access_control in access_controls:
+        if access_control is None:
+            return None
+
+        permission_access = access_control.get(type, {})
+        user_ids.update(permission_access.get("user_ids", []))
+        for group_id in permission_access.get("group_ids", []):
+            user_ids.update(Groups.get_group_user_ids_by_id(group_id) or [])
+    return user_ids
+
+
 # Get all users with access to a resource
 def get_users_with_access(
     type: str = "write", access_control: Optional[dict] = None
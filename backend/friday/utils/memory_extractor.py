@@ -1,11 +1,20 @@
-import json
+import asyncio
 import logging
+import re
 from typing import Optional
 from fastapi import Request
+from fastapi.responses import Response, StreamingResponse
+
+import numpy as np
+import orjson
 
 from friday.utils.chat import generate_chat_completion
 from friday.utils.task import get_task_model_id
 from friday.models.memories import Memories
+from friday.retrieval.embedding_cache import (
+    MEMORY_EMBEDDING_CACHE,
+    cached_embedding_function,
+)
 from friday.retrieval.vector.factory import VECTOR_DB_CLIENT
 
 log = logging.getLogger(__name__)
@@ -41,6 +50,83 @@ Conversation:
 
 Remember: Return ONLY the JSON array, nothing else."""
 
+# The template has a single placeholder, so split it once at import time and
+# assemble prompts by plain concatenation instead of re-parsing it per call
+_PROMPT_PREFIX, _PROMPT_SUFFIX = MEMORY_EXTRACTION_PROMPT.split("{conversation}")
+
+# Cheap prefilter for user statements that could hold something worth
+# remembering; conversations without a match skip the extraction LLM call
+_MEANINGFUL = re.compile(
+    r"\b(my|mine|me|i'?m|i am|i'?ve|i have|i was|i like|i love|i prefer|i work|"
+    r"i live|i hate|i want|i need|call me|birthday|live in|favou?rite)\b",
+    re.IGNORECASE,
+)
+
+
+async def _content_from_streaming_response(response: StreamingResponse):
+    """Read a streamed completion; the raw body is returned if it isn't one"""
+    # Accumulate into a bytearray so each chunk is appended in place
+    body = bytearray()
+    async for chunk in response.body_iterator:
+        body.extend(chunk.encode("utf-8") if isinstance(chunk, str) else chunk)
+
+    # Try to parse as JSON response (orjson parses the raw bytes directly)
+    try:
+        response_data = orjson.loads(body)
+        if "choices" in response_data:
+            return response_data["choices"][0]["message"]["content"]
+    except orjson.JSONDecodeError:
+        pass
+
+    # Not a completion object; search the raw bytes for the array
+    return body
+
+
+async def _content_from_response(response: Response):
+    """Read the completion content from a buffered response such as JSONResponse"""
+    response_body = response.body
+    if not isinstance(response_body, bytes):
+        response_body = str(response_body)
+
+    try:
+        response_data = orjson.loads(response_body)
+    except orjson.JSONDecodeError as e:
+        log.error(f"Failed to parse JSONResponse body as JSON: {e}, body: {response_body[:200]!r}")
+        return None
+
+    if "choices" in response_data:
+        return response_data["choices"][0]["message"]["content"]
+
+    log.error(f"Unexpected JSONResponse format: {response_data}")
+    return None
+
+
+async def _content_from_dict(response: dict):
+    """Read the completion content from a plain dict response"""
+    if "choices" in response and len(response["choices"]) > 0:
+        return response["choices"][0]["message"]["content"]
+
+    log.error(f"Unexpected dict response format: {response}")
+    return None
+
+
+# Completion content extractors by response type; each returns None (after
+# logging why) when the response holds no usable content
+_CONTENT_EXTRACTORS = {
+    StreamingResponse: _content_from_streaming_response,
+    Response: _content_from_response,
+    dict: _content_from_dict,
+}
+
+
+def _get_content_extractor(response):
+    """Find the extractor for the most specific known type of response, if any"""
+    for cls in type(response).__mro__:
+        extractor = _CONTENT_EXTRACTORS.get(cls)
+        if extractor is not None:
+            return extractor
+    return None
+
 
 async def extract_memories_from_conversation(
     request: Request,
@@ -89,22 +175,32 @@ async def extract_memories_from_conversation(
             return []
 
         # Format conversation for the prompt
-        conversation_text = ""
+        parts = []
+        has_candidate = False
         for msg in messages[-10:]:  # Only use last 10 messages to keep context manageable
             role = msg.get("role", "user")
             content = msg.get("content", "")
             if isinstance(content, str):
-                conversation_text += f"{role.capitalize()}: {content}\n\n"
+                parts.append(f"{role.capitalize()}: {content}")
+                if role == "user" and not has_candidate:
+                    has_candidate = _MEANINGFUL.search(content) is not None
+
+        # Small talk yields no memories, so don't spend an LLM call on it
+        if not has_candidate:
+            log.debug("No candidate memory content in conversation, skipping extraction")
+            return []
+
+        conversation_text = "\n\n".join(parts)
 
         # Create the extraction prompt
-        extraction_prompt = MEMORY_EXTRACTION_PROMPT.format(
-            conversation=conversation_text.strip()
+        extraction_prompt = "".join(
+            (_PROMPT_PREFIX, conversation_text.strip(), _PROMPT_SUFFIX)
         )
 
         # Prepare payload for LLM
-        max_tokens = (
-            models[model_id].get("info", {}).get("params", {}).get("max_tokens", 1000)
-        )
+        model_info = models[model_id]
+        params = (model_info.get("info") or {}).get("params") or {}
+        max_tokens = params.get("max_tokens", 1000)
 
         payload = {
             "model": model_id,
@@ -112,7 +208,7 @@ async def extract_memories_from_conversation(
             "stream": False,
             **(
                 {"max_tokens": max_tokens}
-                if models[model_id].get("owned_by") == "ollama"
+                if model_info.get("owned_by") == "ollama"
                 else {
                     "max_completion_tokens": max_tokens,
                 }
@@ -129,67 +225,33 @@ async def extract_memories_from_conversation(
         )
 
         # Parse response
-        if hasattr(response, "body_iterator"):
-            # Streaming response (StreamingResponse)
-            body = b""
-            async for chunk in response.body_iterator:
-                body += chunk
-            response_text = body.decode("utf-8")
-
-            # Try to parse as JSON response
-            try:
-                response_data = json.loads(response_text)
-                if "choices" in response_data:
-                    content = response_data["choices"][0]["message"]["content"]
-                else:
-                    content = response_text
-            except json.JSONDecodeError:
-                content = response_text
-        elif hasattr(response, "body"):
-            # JSONResponse - has body but not body_iterator
-            response_body = response.body
-            if isinstance(response_body, bytes):
-                response_text = response_body.decode("utf-8")
-            else:
-                response_text = str(response_body)
+        extractor = _get_content_extractor(response)
+        if extractor is None:
+            log.error(f"Unexpected response type for memory extraction: {type(response)}")
+            return []
 
-            # Try to parse as JSON response
-            try:
-                response_data = json.loads(response_text)
-                if "choices" in response_data:
-                    content = response_data["choices"][0]["message"]["content"]
-                else:
-                    log.error(f"Unexpected JSONResponse format: {response_data}")
-                    return []
-            except json.JSONDecodeError as e:
-                log.error(f"Failed to parse JSONResponse body as JSON: {e}, body: {response_text[:200]}")
-                return []
-        elif isinstance(response, dict):
-            # Plain dict response
-            if "choices" in response and len(response["choices"]) > 0:
-                content = response["choices"][0]["message"]["content"]
-            else:
-                log.error(f"Unexpected dict response format: {response}")
-                return []
-        else:
-            # Fallback to string conversion
-            content = str(response)
+        content = await extractor(response)
+        if content is None:
+            return []
 
         # Extract JSON array from the content
         # The LLM might wrap it in markdown or extra text
         try:
-            # Ensure content is a string
-            if not isinstance(content, str):
+            # Raw response bodies are searched as bytes so they never need decoding
+            if isinstance(content, (bytes, bytearray)):
+                open_bracket, close_bracket = b"[", b"]"
+            elif isinstance(content, str):
+                open_bracket, close_bracket = "[", "]"
+            else:
                 log.error(f"Content is not a string, it's {type(content)}: {content}")
                 return []
 
             # Find JSON array in the response
-            start_idx = content.find("[")
-            end_idx = content.rfind("]") + 1
+            start_idx = content.find(open_bracket)
+            end_idx = content.rfind(close_bracket) + 1
 
             if start_idx != -1 and end_idx > start_idx:
-                json_str = content[start_idx:end_idx]
-                memories = json.loads(json_str)
+                memories = orjson.loads(content[start_idx:end_idx])
 
                 # Validate it's a list of strings
                 if isinstance(memories, list):
@@ -203,7 +265,7 @@ async def extract_memories_from_conversation(
                 log.warning("No JSON array found in response")
                 return []
 
-        except json.JSONDecodeError as e:
+        except orjson.JSONDecodeError as e:
             log.error(f"Failed to parse extracted memories as JSON: {e}")
             return []
         except Exception as e:
@@ -232,77 +294,147 @@ async def save_extracted_memories(
     Returns:
         Number of memories successfully saved
     """
-    saved_count = 0
     SIMILARITY_THRESHOLD = 0.85  # Skip if 85% or more similar
+    collection_name = f"user-memory-{user.id}"
+
+    # Strip, drop empties and collapse exact repeats within the batch
+    memories = list(dict.fromkeys(m.strip() for m in memories if m and m.strip()))
+    if not memories:
+        return 0
+
+    # Embed all memories in one batched call instead of one call per memory;
+    # memories embedded recently are served from the cache
+    embedding_function = cached_embedding_function(
+        request.app.state.EMBEDDING_FUNCTION,
+        request.app.state.config.RAG_EMBEDDING_MODEL,
+        MEMORY_EMBEDDING_CACHE,
+    )
+    try:
+        embeddings = await asyncio.to_thread(embedding_function, memories, user=user)
+    except Exception as e:
+        log.error(f"Failed to embed extracted memories: {e}")
+        return 0
+
+    # Drop memories whose embedding is missing or has the wrong dimension so
+    # the rest of the batch can still be compared and saved
+    embeddings = list(embeddings) if embeddings is not None else []
+    dims = [len(e) for e in embeddings if e is not None and len(e)]
+    dim = max(set(dims), key=dims.count) if dims else 0
+    valid = [
+        (memory_text, embedding)
+        for memory_text, embedding in zip(memories, embeddings)
+        if embedding is not None and len(embedding) == dim
+    ]
+    if len(valid) < len(memories):
+        log.warning(
+            f"Dropping {len(memories) - len(valid)} memories without a valid embedding"
+        )
+    if not valid:
+        return 0
+    memories = [memory_text for memory_text, _ in valid]
+    embeddings = [embedding for _, embedding in valid]
+
+    # Look up the closest existing memory for every new one in a single search;
+    # row i of the result belongs to memory i. The vector and SQL clients are
+    # synchronous, so they run in worker threads to keep the event loop free
+    search_results = None
+    try:
+        search_results = await asyncio.to_thread(
+            VECTOR_DB_CLIENT.search,
+            collection_name=collection_name,
+            vectors=embeddings,
+            limit=1,  # Only need the most similar one
+        )
+    except Exception as e:
+        # If search fails, log but continue with save (fail-safe)
+        log.warning(f"Failed to check for similar memories: {e}. Proceeding with save.")
+
+    distances = search_results.distances if search_results and search_results.distances else []
+    documents = search_results.documents if search_results and search_results.documents else []
+
+    # Pairwise similarities within the batch, on the same 0-1 scale as the
+    # vector DB scores above, so paraphrases of one fact are only saved once
+    vectors = np.asarray(embeddings, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    vectors /= np.where(norms == 0, 1, norms)
+    batch_similarities = (1 + vectors @ vectors.T) / 2
+
+    kept = []
+    new_memories = []
+    new_embeddings = []
+    for i, (memory_text, memory_embedding) in enumerate(zip(memories, embeddings)):
+        # Check if similar memory exists
+        # ChromaDB client already normalizes distances to 0-1 similarity scores
+        # 1.0 = perfect match, 0.0 = completely different
+        if i < len(distances) and distances[i]:
+            similarity = distances[i][0]
+            similar_text = documents[i][0]
+
+            if similarity >= SIMILARITY_THRESHOLD:
+                log.info(
+                    f"Skipping duplicate memory (similarity: {similarity:.2f}): "
+                    f"{memory_text[:50]}... "
+                    f"(similar to: {similar_text[:50]}...)"
+                )
+                continue  # Skip this memory
+
+        # Check if a similar memory is already being saved from this batch
+        if kept:
+            j = kept[int(np.argmax(batch_similarities[i, kept]))]
+            similarity = float(batch_similarities[i, j])
+            if similarity >= SIMILARITY_THRESHOLD:
+                log.info(
+                    f"Skipping duplicate memory (similarity: {similarity:.2f}): "
+                    f"{memory_text[:50]}... "
+                    f"(similar to: {memories[j][:50]}...)"
+                )
+                continue
 
-    for memory_content in memories:
-        if not memory_content or not memory_content.strip():
-            continue
+        kept.append(i)
+        new_memories.append(memory_text)
+        new_embeddings.append(memory_embedding)
 
-        try:
-            collection_name = f"user-memory-{user.id}"
-            memory_text = memory_content.strip()
-
-            # Get embedding for new memory
-            memory_embedding = request.app.state.EMBEDDING_FUNCTION(
-                memory_text, user=user
-            )
-
-            # Check if similar memory already exists
-            try:
-                search_results = VECTOR_DB_CLIENT.search(
-                    collection_name=collection_name,
-                    vectors=[memory_embedding],
-                    limit=1,  # Only need the most similar one
-                )
+    if not new_memories:
+        return 0
+
+    try:
+        # Save to SQL database in one transaction
+        saved = await asyncio.to_thread(
+            Memories.insert_new_memories_bulk, user.id, new_memories
+        )
+    except Exception as e:
+        log.error(f"Failed to save {len(new_memories)} memories for user {user.id}: {e}")
+        return 0
 
-                # Check if similar memory exists
-                # SearchResult has nested lists: distances[0][i], documents[0][i]
-                if (
-                    search_results
-                    and hasattr(search_results, "distances")
-                    and search_results.distances
-                    and len(search_results.distances[0]) > 0
-                ):
-                    # ChromaDB client already normalizes distances to 0-1 similarity scores
-                    # 1.0 = perfect match, 0.0 = completely different
-                    similarity = search_results.distances[0][0]
-                    similar_text = search_results.documents[0][0]
-
-                    if similarity >= SIMILARITY_THRESHOLD:
-                        log.info(
-                            f"Skipping duplicate memory (similarity: {similarity:.2f}): "
-                            f"{memory_text[:50]}... "
-                            f"(similar to: {similar_text[:50]}...)"
-                        )
-                        continue  # Skip this memory
-
-            except Exception as e:
-                # If search fails, log but continue with save (fail-safe)
-                log.warning(f"Failed to check for similar memories: {e}. Proceeding with save.")
-
-            # Save to SQL database
-            memory = Memories.insert_new_memory(user.id, memory_text)
-
-            # Save to vector database
-            VECTOR_DB_CLIENT.upsert(
-                collection_name=collection_name,
-                items=[
-                    {
-                        "id": memory.id,
-                        "text": memory.content,
-                        "vector": memory_embedding,  # Reuse the embedding we already created
-                        "metadata": {"created_at": memory.created_at},
-                    }
-                ],
-            )
-
-            saved_count += 1
-            log.info(f"Saved memory for user {user.id}: {memory_text[:50]}...")
+    try:
+        # Save to vector database in one upsert
+        await asyncio.to_thread(
+            VECTOR_DB_CLIENT.upsert,
+            collection_name=collection_name,
+            items=[
+                {
+                    "id": memory.id,
+                    "text": memory.content,
+                    "vector": memory_embedding,  # Reuse the embedding we already created
+                    "metadata": {"created_at": memory.created_at},
+                }
+                for memory, memory_embedding in zip(saved, new_embeddings)
+            ],
+        )
+    except Exception as e:
+        # Remove the SQL rows again so no memory exists without its vector
+        log.error(f"Failed to index {len(saved)} memories for user {user.id}: {e}")
+        deleted = await asyncio.to_thread(
+            Memories.delete_memories_by_ids_and_user_id,
+            [memory.id for memory in saved],
+            user.id,
+        )
+        if not deleted:
+            log.error(f"Failed to roll back unindexed memories for user {user.id}")
+        return 0
 
-        except Exception as e:
-            log.error(f"Failed to save memory '{memory_content[:50]}...': {e}")
-            continue
+    saved_count = len(saved)
+    log.info(f"Saved {saved_count} memories for user {user.id}")
 
     return saved_count
 
@@ -631,6 +631,7 @@ async def chat_unified_knowledge_search_handler(
             k_reranker=request.app.state.config.RAG_TOP_K_RERANKER if hasattr(request.app.state.config, 'RAG_TOP_K_RERANKER') else 3,
             r=request.app.state.config.RAG_RELEVANCE_THRESHOLD,
             hybrid_bm25_weight=request.app.state.config.RAG_HYBRID_BM25_WEIGHT,
+            embedding_model=request.app.state.config.RAG_EMBEDDING_MODEL,
         )
 
         # Check if we have any results at all
@@ -4,19 +4,51 @@ Simple PNG generator using PIL/Pillow only
 Creates basic colored circles as placeholders for Friday logo
 """
 
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
 from PIL import Image, ImageDraw, ImageFont
+import numpy as np
 import os
 
 staticdir = "./static/static"
 
-def create_arc_reactor_png(size, output_path, dark_mode=False):
-    """Create a simple arc reactor inspired icon"""
-    # Create image with transparency
-    img = Image.new('RGBA', (size, size), (0, 0, 0, 0))
-    draw = ImageDraw.Draw(img)
+# These are one-shot build artifacts, so favor encode speed over file size
+PNG_COMPRESS_LEVEL = 1
 
-    center = size // 2
+# System fonts tried in order before falling back to Pillow's built-in font
+_FONT_PATHS = (
+    "/System/Library/Fonts/Helvetica.ttc",
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+)
 
+@lru_cache(maxsize=16)
+def _load_font(size):
+    """Load the first available system font at the given size, parsed once per size"""
+    for path in _FONT_PATHS:
+        try:
+            return ImageFont.truetype(path, size)
+        except OSError:
+            continue
+    return ImageFont.load_default()
+
+@lru_cache(maxsize=16)
+def _radius_field(size, center):
+    """Distance of every pixel from (center, center), as a read-only (size, size) array"""
+    yy, xx = np.ogrid[:size, :size]
+    r = np.hypot(xx - center, yy - center)
+    r.flags.writeable = False
+    return r
+
+def _paint_circle(arr, r, radius, fill=None, outline=None, width=1):
+    """Paint a filled and/or outlined circle onto an RGBA array, like draw.ellipse"""
+    if fill is not None:
+        arr[r <= radius] = fill
+    if outline is not None:
+        arr[(r <= radius) & (r > radius - width)] = outline
+
+@lru_cache(maxsize=32)
+def _arc_reactor_geometry(size, dark_mode):
+    """Circles making up the arc reactor icon, as (radius, fill, outline, width) in paint order"""
     # Colors
     if dark_mode:
         bg_color = (10, 14, 26, 255)  # Dark background
@@ -27,88 +59,71 @@ def create_arc_reactor_png(size, output_path, dark_mode=False):
         blue = (30, 144, 255, 255)  # Dodger blue
         gold = (212, 175, 55, 255)
 
-    # Background circle
-    draw.ellipse([0, 0, size-1, size-1], fill=bg_color)
-
-    # Outer gold ring
     ring_width = max(2, size // 40)
-    draw.ellipse([ring_width*2, ring_width*2, size-ring_width*2-1, size-ring_width*2-1],
-                 outline=gold, width=ring_width)
-
-    # Blue energy rings
-    blue_transparent = (blue[0], blue[1], blue[2], 180)
-    draw.ellipse([size//4, size//4, size*3//4, size*3//4],
-                 outline=blue_transparent, width=max(1, ring_width//2))
-
-    # Center blue circle with glow
-    center_size = size // 3
-    margin = (size - center_size) // 2
-    draw.ellipse([margin, margin, margin+center_size, margin+center_size],
-                 fill=(blue[0], blue[1], blue[2], 100),
-                 outline=blue, width=max(1, ring_width//2))
-
-    # Inner gold ring
-    inner_size = size // 5
-    inner_margin = (size - inner_size) // 2
-    draw.ellipse([inner_margin, inner_margin, inner_margin+inner_size, inner_margin+inner_size],
-                 outline=gold, width=max(1, ring_width//3))
-
-    # Bright center
-    core_size = size // 10
-    core_margin = (size - core_size) // 2
-    draw.ellipse([core_margin, core_margin, core_margin+core_size, core_margin+core_size],
-                 fill=(255, 255, 255, 230))
-
-    img.save(output_path, 'PNG')
+
+    return (
+        # Background circle
+        ((size - 1) / 2, bg_color, None, 1),
+        # Outer gold ring
+        ((size - 1) / 2 - ring_width * 2, None, gold, ring_width),
+        # Blue energy rings
+        ((size * 3 // 4 - size // 4) / 2, None, (blue[0], blue[1], blue[2], 180), max(1, ring_width//2)),
+        # Center blue circle with glow
+        (size // 3 / 2, (blue[0], blue[1], blue[2], 100), blue, max(1, ring_width//2)),
+        # Inner gold ring
+        (size // 5 / 2, None, gold, max(1, ring_width//3)),
+        # Bright center
+        (size // 10 / 2, (255, 255, 255, 230), None, 1),
+    )
+
+def create_arc_reactor_png(size, output_path, dark_mode=False):
+    """Create a simple arc reactor inspired icon"""
+    # Transparent RGBA canvas and one distance field shared by all rings
+    arr = np.zeros((size, size, 4), dtype=np.uint8)
+    r = _radius_field(size, (size - 1) / 2)
+
+    for radius, fill, outline, width in _arc_reactor_geometry(size, dark_mode):
+        _paint_circle(arr, r, radius, fill=fill, outline=outline, width=width)
+
+    Image.fromarray(arr, 'RGBA').save(output_path, 'PNG', compress_level=PNG_COMPRESS_LEVEL)
     print(f"  ✓ Created {os.path.basename(output_path)} ({size}x{size})")
 
 def create_splash_png(size, output_path, dark_mode=False):
     """Create splash screen with Friday text"""
-    img = Image.new('RGBA', (size, size), (255, 255, 255, 255) if not dark_mode else (10, 14, 26, 255))
-    draw = ImageDraw.Draw(img)
+    arr = np.empty((size, size, 4), dtype=np.uint8)
+    arr[:] = (255, 255, 255, 255) if not dark_mode else (10, 14, 26, 255)
 
     # Draw arc reactor logo at top
     logo_size = size // 3
     logo_y = size // 4
     logo_x = (size - logo_size) // 2
 
-    # Mini arc reactor
-    center_x = size // 2
-    center_y = logo_y + logo_size // 2
+    # Mini arc reactor; all rings share the logo's center, so slice out the
+    # logo's bounding box and rasterize it against a single distance field
+    logo = arr[logo_y:logo_y+logo_size+1, logo_x:logo_x+logo_size+1]
+    r = _radius_field(logo_size + 1, logo_size / 2)
 
     blue = (79, 195, 247, 255) if dark_mode else (30, 144, 255, 255)
     gold = (212, 175, 55, 255)
 
     # Outer ring
-    draw.ellipse([logo_x, logo_y, logo_x+logo_size, logo_y+logo_size],
-                 outline=gold, width=max(2, logo_size//30))
+    _paint_circle(logo, r, logo_size / 2,
+                  outline=gold, width=max(2, logo_size//30))
 
     # Blue circle
-    inner_size = logo_size * 2 // 3
-    inner_margin = (logo_size - inner_size) // 2
-    draw.ellipse([logo_x+inner_margin, logo_y+inner_margin,
-                  logo_x+inner_margin+inner_size, logo_y+inner_margin+inner_size],
-                 fill=(blue[0], blue[1], blue[2], 100),
-                 outline=blue, width=max(2, logo_size//40))
+    _paint_circle(logo, r, logo_size * 2 // 3 / 2,
+                  fill=(blue[0], blue[1], blue[2], 100),
+                  outline=blue, width=max(2, logo_size//40))
 
     # Center
-    core_size = logo_size // 6
-    core_margin = (logo_size - core_size) // 2
-    draw.ellipse([logo_x+core_margin, logo_y+core_margin,
-                  logo_x+core_margin+core_size, logo_y+core_margin+core_size],
-                 fill=(255, 255, 255, 255))
+    _paint_circle(logo, r, logo_size // 6 / 2, fill=(255, 255, 255, 255))
+
+    img = Image.fromarray(arr, 'RGBA')
+    draw = ImageDraw.Draw(img)
 
     # Add "FRIDAY" text
     try:
-        font_size = size // 10
-        # Try to use a system font
-        try:
-            font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", font_size)
-        except:
-            try:
-                font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", font_size)
-            except:
-                font = ImageFont.load_default()
+        font = _load_font(size // 10)
 
         text = "FRIDAY"
         # Get text size using textbbox
@@ -122,11 +137,7 @@ def create_splash_png(size, output_path, dark_mode=False):
         draw.text((text_x, text_y), text, fill=text_color, font=font)
 
         # Subtitle
-        small_font_size = size // 25
-        try:
-            small_font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", small_font_size)
-        except:
-            small_font = font
+        small_font = _load_font(size // 25)
 
         subtitle = "Your AI Assistant"
         bbox = draw.textbbox((0, 0), subtitle, font=small_font)
@@ -139,29 +150,37 @@ def create_splash_png(size, output_path, dark_mode=False):
     except Exception as e:
         print(f"    Warning: Could not add text: {e}")
 
-    img.save(output_path, 'PNG')
+    img.save(output_path, 'PNG', compress_level=PNG_COMPRESS_LEVEL)
     print(f"  ✓ Created {os.path.basename(output_path)} ({size}x{size})")
 
+def _render(job):
+    """Render a single (func, size, filename, dark_mode) job"""
+    func, size, filename, dark_mode = job
+    func(size, os.path.join(staticdir, filename), dark_mode=dark_mode)
+
 def main():
     print("\n🎨 Friday Logo PNG Generation (Simple Mode)\n")
     print("Generating PNG files using Pillow...\n")
 
-    # Generate favicons
-    create_arc_reactor_png(512, os.path.join(staticdir, "favicon.png"), dark_mode=False)
-    create_arc_reactor_png(96, os.path.join(staticdir, "favicon-96x96.png"), dark_mode=False)
-    create_arc_reactor_png(512, os.path.join(staticdir, "favicon-dark.png"), dark_mode=True)
-
-    # Generate splash screens
-    create_splash_png(512, os.path.join(staticdir, "splash.png"), dark_mode=False)
-    create_splash_png(512, os.path.join(staticdir, "splash-dark.png"), dark_mode=True)
-
-    # Generate logo
-    create_arc_reactor_png(512, os.path.join(staticdir, "logo.png"), dark_mode=False)
-
-    # Generate PWA icons
-    create_arc_reactor_png(180, os.path.join(staticdir, "apple-touch-icon.png"), dark_mode=False)
-    create_arc_reactor_png(192, os.path.join(staticdir, "web-app-manifest-192x192.png"), dark_mode=False)
-    create_arc_reactor_png(512, os.path.join(staticdir, "web-app-manifest-512x512.png"), dark_mode=False)
+    jobs = [
+        # Favicons
+        (create_arc_reactor_png, 512, "favicon.png", False),
+        (create_arc_reactor_png, 96, "favicon-96x96.png", False),
+        (create_arc_reactor_png, 512, "favicon-dark.png", True),
+        # Splash screens
+        (create_splash_png, 512, "splash.png", False),
+        (create_splash_png, 512, "splash-dark.png", True),
+        # Logo
+        (create_arc_reactor_png, 512, "logo.png", False),
+        # PWA icons
+        (create_arc_reactor_png, 180, "apple-touch-icon.png", False),
+        (create_arc_reactor_png, 192, "web-app-manifest-192x192.png", False),
+        (create_arc_reactor_png, 512, "web-app-manifest-512x512.png", False),
+    ]
+
+    # Every image is independent and CPU bound, so render them in parallel
+    with ProcessPoolExecutor() as executor:
+        list(executor.map(_render, jobs))
 
     print("\n✅ PNG generation complete!\n")
     print("Note: These are simplified versions. For better quality:")
@@ -8,6 +8,9 @@ import os
 
 staticdir = "./static/static"
 
+# These are one-shot build artifacts, so favor encode speed over file size
+PNG_COMPRESS_LEVEL = 1
+
 def create_splash_png(size, output_path, dark_mode=False):
     """Create splash screen with transparent background and arc reactor logo"""
     # Transparent background
@@ -82,7 +85,7 @@ def create_splash_png(size, output_path, dark_mode=False):
                   logo_x+core_margin+core_size, logo_y+core_margin+core_size],
                  fill=(255, 255, 255, 255))
 
-    img.save(output_path, 'PNG')
+    img.save(output_path, 'PNG', compress_level=PNG_COMPRESS_LEVEL)
     print(f"  ✓ Created {os.path.basename(output_path)} ({size}x{size})")
 
 def main():